@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/4.2/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
+import importlib.util
 import os
 from dotenv import load_dotenv
 from pathlib import Path
@@ -30,6 +31,10 @@ DEBUG = True
 
 ALLOWED_HOSTS = []
 
+# drf_yasg is imported lazily on the first schema request. Installing it as an app would import
+# it (and pkg_resources) at boot, so only its templates and static files are registered.
+DRF_YASG_DIR = Path(importlib.util.find_spec('drf_yasg').origin).parent
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -41,14 +46,14 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'restaurants.apps.RestaurantsConfig',
 
-    'drf_yasg',
-
     'rest_framework',
     'rest_framework_simplejwt',
 
 ]
 
 MIDDLEWARE = [
+    'restaurants.middleware.PerformanceInstrumentationMiddleware',
+    'restaurants.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -64,7 +69,7 @@ ROOT_URLCONF = 'lunch_decider.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [BASE_DIR / 'templates']
+        'DIRS': [BASE_DIR / 'templates', DRF_YASG_DIR / 'templates']
         ,
         'APP_DIRS': True,
         'OPTIONS': {
@@ -91,9 +96,78 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        # Seconds to keep a connection open between requests; health checks replace a
+        # persistent connection that died in the meantime. lunch_decider.asgi defaults this to 0,
+        # since ASGI requests each run on a new thread and would leave their connections open.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() in ('1', 'true', 'yes'),
+        # Used by the restaurants.backends.pooled_postgresql engine for ASGI deployments; it
+        # ignores CONN_MAX_AGE so connections go back to the pool after each request.
+        'POOL': {
+            'SIZE': int(os.getenv('DB_POOL_SIZE', 10)),
+            'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+        },
     }
 }
 
+# Read replicas: a comma-separated list of host[:port] entries (database files for SQLite).
+# Replicas mirror the primary in tests, so the router runs against the test database.
+DATABASE_REPLICAS = []
+for number, replica in enumerate(filter(None, os.getenv('DB_REPLICAS', '').split(',')), start=1):
+    if (DATABASES['default']['ENGINE'] or '').endswith('sqlite3'):
+        location = {'NAME': replica}
+    else:
+        host, _, port = replica.partition(':')
+        location = {'HOST': host, 'PORT': port or DATABASES['default']['PORT']}
+    DATABASES[f'replica_{number}'] = {**DATABASES['default'], **location, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica_{number}')
+
+DATABASE_ROUTERS = ['restaurants.routers.ReplicaRouter']
+# 'round_robin' or 'least_recent'.
+DATABASE_REPLICA_SELECTION = os.getenv('DB_REPLICA_SELECTION', 'round_robin')
+# After a write, the client's reads stay on the primary for this many seconds. The pin travels in
+# a signed cookie; clients without cookies rely on the cache alias below, which must be shared
+# between workers (not LocMem) for that to hold across processes.
+DATABASE_REPLICA_STICKY_SECONDS = int(os.getenv('DB_REPLICA_STICKY_SECONDS', 5))
+DATABASE_REPLICA_CACHE_ALIAS = os.getenv('DB_REPLICA_CACHE_ALIAS', 'default')
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'lunch-decider'),
+    },
+    # Authenticated users get their own alias (one entry per active user) so they never cull
+    # menu payloads or version counters out of the default cache.
+    'auth': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'lunch-decider'),
+        'KEY_PREFIX': 'auth',
+    },
+}
+if CACHES['auth']['BACKEND'].endswith('LocMemCache'):
+    # LocMem caches with the same LOCATION share storage and its 300-entry default limit.
+    CACHES['auth']['LOCATION'] = 'lunch-decider-auth'
+    CACHES['auth']['OPTIONS'] = {'MAX_ENTRIES': int(os.getenv('AUTH_CACHE_MAX_ENTRIES', 5000))}
+
+MENU_CACHE_ALIAS = os.getenv('MENU_CACHE_ALIAS', 'default')
+MENU_CACHE_TIMEOUT = int(os.getenv('MENU_CACHE_TIMEOUT', 3600))
+
+API_KEY_CACHE_SIZE = int(os.getenv('API_KEY_CACHE_SIZE', 1024))
+API_KEY_CACHE_TTL = int(os.getenv('API_KEY_CACHE_TTL', 60))
+
+# Live results (Server-Sent Events). Use restaurants.live.CacheResultsBroker with a shared
+# cache backend when running several workers.
+LIVE_RESULTS_BACKEND = os.getenv('LIVE_RESULTS_BACKEND', 'restaurants.live.InProcessResultsBroker')
+LIVE_RESULTS_CACHE_ALIAS = os.getenv('LIVE_RESULTS_CACHE_ALIAS', 'default')
+LIVE_RESULTS_INTERVAL = float(os.getenv('LIVE_RESULTS_INTERVAL', 1.0))
+LIVE_RESULTS_KEEPALIVE = float(os.getenv('LIVE_RESULTS_KEEPALIVE', 15.0))
+# Seconds before a stream is closed; clients reconnect after LIVE_RESULTS_RETRY seconds.
+LIVE_RESULTS_MAX_AGE = float(os.getenv('LIVE_RESULTS_MAX_AGE', 300.0))
+LIVE_RESULTS_RETRY = float(os.getenv('LIVE_RESULTS_RETRY', 2.0))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -127,6 +201,7 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATICFILES_DIRS = [DRF_YASG_DIR / 'static']
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -135,10 +210,19 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'restaurants.authentication.CachedJWTAuthentication',
     ),
+    'DEFAULT_PAGINATION_CLASS': 'restaurants.pagination.KeysetPagination',
+    'PAGE_SIZE': int(os.getenv('API_PAGE_SIZE', 50)),
 }
 
+# Compact JSON rendering through orjson (when installed) instead of the standard library encoder.
+if os.getenv('API_FAST_JSON', 'False').lower() in ('1', 'true', 'yes'):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
+        'restaurants.renderers.CompactJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    )
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
@@ -146,6 +230,40 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
 }
 
+EMPLOYEE_IMPORT_WORKERS = int(os.getenv('EMPLOYEE_IMPORT_WORKERS', os.cpu_count() or 1))
+
+# Per-request timing (Server-Timing header and structured log lines). Off by default.
+PERF_INSTRUMENTATION_ENABLED = os.getenv('PERF_INSTRUMENTATION_ENABLED', 'False').lower() in ('1', 'true', 'yes')
+PERF_SLOW_QUERY_THRESHOLD_MS = float(os.getenv('PERF_SLOW_QUERY_THRESHOLD_MS', 100))
+PERF_SLOW_QUERY_LOG_COUNT = int(os.getenv('PERF_SLOW_QUERY_LOG_COUNT', 5))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'restaurants.performance': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# Monthly vote partitions (PostgreSQL only, see `manage.py partition_votes`).
+VOTE_PARTITION_MONTHS_AHEAD = int(os.getenv('VOTE_PARTITION_MONTHS_AHEAD', 3))
+VOTE_PARTITION_RETAIN_MONTHS = int(os.getenv('VOTE_PARTITION_RETAIN_MONTHS', 0))
+
+# Authenticated users are cached for a short time; read-only endpoints can skip the
+# lookup entirely and trust the signed token claims.
+AUTH_USER_CACHE_ALIAS = os.getenv('AUTH_USER_CACHE_ALIAS', 'auth')
+AUTH_USER_CACHE_TTL = int(os.getenv('AUTH_USER_CACHE_TTL', 60))
+AUTH_TRUST_TOKEN_CLAIMS = os.getenv('AUTH_TRUST_TOKEN_CLAIMS', 'False').lower() in ('1', 'true', 'yes')
+
+# Schemas are generated once per worker, or read from OPENAPI_SCHEMA_DIR when
+# `manage.py generate_openapi_schemas` wrote them there.
+OPENAPI_SCHEMA_DIR = os.getenv('OPENAPI_SCHEMA_DIR', '')
+OPENAPI_SCHEMA_URL = os.getenv('OPENAPI_SCHEMA_URL') or None
+OPENAPI_SCHEMA_MAX_AGE = int(os.getenv('OPENAPI_SCHEMA_MAX_AGE', 3600))
+
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {
         'Bearer': {
@@ -22,58 +22,37 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 
-from rest_framework import permissions
 from rest_framework import routers
 
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
+from restaurants.views.schema import SchemaDocumentView, SchemaUIView
 from restaurants.views.v1.views import RestaurantViewSetV1, MenuViewSet, EmployeeViewSet, CurrentDayResultsViewSet, DishViewSet, \
-    VoteViewSet, CurrentDayMenuView
+    VoteViewSet, CurrentDayMenuView, MenuCacheStatsView, CurrentDayResultsStreamView, \
+    VoteAnalyticsView, CurrentDayRankedResultsViewSet, RankedBallotView, DatabasePoolStatsView
 from restaurants.views.v2.views import RestaurantViewSetV2
 
-schema_view_v1 = get_schema_view(
-    openapi.Info(
-        title="Lunch Decider API",
-        default_version='v1',
-        description="API for lunch decision making - Version 1",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="contact@lunchdecider.local"),
-        license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
-
-schema_view_v2 = get_schema_view(
-    openapi.Info(
-        title="Lunch Decider API",
-        default_version='v2',
-        description="API for lunch decision making - Version 2",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="contact@lunchdecider.local"),
-        license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
-
 current_day_results = CurrentDayResultsViewSet.as_view({'get': 'list'})
+current_day_ranked_results = CurrentDayRankedResultsViewSet.as_view({'get': 'list'})
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 
-    path('swagger<format>/', schema_view_v1.without_ui(cache_timeout=0), name='schema-json'),
-    path('swagger/', schema_view_v1.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view_v1.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('swagger<format>/', SchemaDocumentView.as_view(version='v1'), name='schema-json'),
+    path('swagger/', SchemaUIView.as_view(version='v1', ui='swagger'), name='schema-swagger-ui'),
+    path('redoc/', SchemaUIView.as_view(version='v1', ui='redoc'), name='schema-redoc'),
 
-    path('swagger/v2<format>/', schema_view_v2.without_ui(cache_timeout=0), name='schema-json-v2'),
-    path('swagger/v2/', schema_view_v2.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui-v2'),
+    path('swagger/v2<format>/', SchemaDocumentView.as_view(version='v2'), name='schema-json-v2'),
+    path('swagger/v2/', SchemaUIView.as_view(version='v2', ui='swagger'), name='schema-swagger-ui-v2'),
 
     path('results/current/', current_day_results, name='current_results'),
+    path('results/current/ranked/', current_day_ranked_results, name='current_ranked_results'),
+    path('results/current/stream/', CurrentDayResultsStreamView.as_view(), name='current_results_stream'),
+    path('api/v1/ballots/', RankedBallotView.as_view(), name='ranked_ballot'),
+    path('api/v1/analytics/votes/', VoteAnalyticsView.as_view(), name='vote_analytics'),
     path('menu/current_day/', CurrentDayMenuView.as_view(), name='current_day_menu'),
+    path('menu/cache_stats/', MenuCacheStatsView.as_view(), name='menu_cache_stats'),
+    path('db/pool_stats/', DatabasePoolStatsView.as_view(), name='db_pool_stats'),
 ]
 
 router_v1 = routers.DefaultRouter()
@@ -1,8 +1,11 @@
 from django.contrib import admin
 
-from restaurants.models import Restaurant, Dish, Menu, Vote
+from restaurants.models import Restaurant, Dish, Menu, Vote, VoteTally, DailyVoteRollup, RankedBallot
 
 admin.site.register(Restaurant)
 admin.site.register(Dish)
 admin.site.register(Menu)
 admin.site.register(Vote)
+admin.site.register(VoteTally)
+admin.site.register(DailyVoteRollup)
+admin.site.register(RankedBallot)
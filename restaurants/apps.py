@@ -5,4 +5,5 @@ class RestaurantsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'restaurants'
 
-
+    def ready(self):
+        from restaurants import signals  # noqa: F401
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import prefetch_related_objects
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def invalidate_cached_users(*user_ids):
+    caches[settings.AUTH_USER_CACHE_ALIAS].delete_many([user_cache_key(user_id) for user_id in user_ids])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        cache = caches[settings.AUTH_USER_CACHE_ALIAS]
+        user = cache.get(user_cache_key(user_id))
+        if user is None:
+            user = super().get_user(validated_token)
+            prefetch_related_objects([user], 'groups')
+            cache.set(user_cache_key(user_id), user, settings.AUTH_USER_CACHE_TTL)
+            return user
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
+
+
+class TokenClaimsAuthentication(CachedJWTAuthentication):
+    # Read-only requests can trust the signed claims and skip the user lookup entirely.
+    def authenticate(self, request):
+        self.trust_claims = settings.AUTH_TRUST_TOKEN_CLAIMS and request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if getattr(self, 'trust_claims', False):
+            return JWTStatelessUserAuthentication.get_user(self, validated_token)
+        return super().get_user(validated_token)
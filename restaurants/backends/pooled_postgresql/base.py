@@ -0,0 +1,57 @@
+from django.db import DEFAULT_DB_ALIAS
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from restaurants.db_pool import PoolTimeout, connection_pool
+
+
+def check_connection(connection):
+    if connection.closed:
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        return True
+    except base.Database.Error:
+        return False
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    # PostgreSQL backend that borrows connections from a per-worker pool and returns them on close.
+    # CONN_MAX_AGE is forced to 0 so every request hands its connection back; under ASGI each
+    # request gets a new wrapper, and a persistent one would hold its pool slot until it expires.
+
+    def __init__(self, settings_dict, alias=DEFAULT_DB_ALIAS):
+        super().__init__({**settings_dict, 'CONN_MAX_AGE': 0}, alias)
+
+    @property
+    def pool(self):
+        options = self.settings_dict.get('POOL', {})
+        check = check_connection if self.settings_dict['CONN_HEALTH_CHECKS'] else (lambda connection: not connection.closed)
+        return connection_pool(self.alias, options.get('SIZE', 10), options.get('TIMEOUT', 10), check)
+
+    def get_new_connection(self, conn_params):
+        try:
+            connection = self.pool.checkout(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+        except PoolTimeout as exc:
+            raise base.Database.OperationalError(str(exc)) from exc
+        # Reused connections skip the parent's isolation level setup.
+        self.isolation_level = IsolationLevel(
+            self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED))
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            self.pool.release(self.connection, self._reset(self.connection))
+
+    @staticmethod
+    def _reset(connection):
+        if connection.closed:
+            return False
+        try:
+            # A non-idle status means a transaction is still open or has failed.
+            if connection.info.transaction_status:
+                connection.rollback()
+            return True
+        except base.Database.Error:
+            return False
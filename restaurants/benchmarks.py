@@ -0,0 +1,92 @@
+import math
+import time
+import uuid
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from restaurants.cache import restaurant_key_cache
+from restaurants.loadgen import generate_load_data
+from restaurants.models import Menu
+
+SCALES = {
+    'small': {'restaurants': 5, 'dishes_per_restaurant': 10, 'days': 5, 'employees': 50},
+    'medium': {'restaurants': 20, 'dishes_per_restaurant': 30, 'days': 30, 'employees': 500},
+    'large': {'restaurants': 50, 'dishes_per_restaurant': 50, 'days': 90, 'employees': 2000},
+}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies, query_counts):
+    return {
+        'requests': len(latencies),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p90_ms': round(percentile(latencies, 90), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'max_ms': round(max(latencies), 3),
+        'queries_mean': round(sum(query_counts) / len(query_counts), 2),
+        'queries_max': max(query_counts),
+    }
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+    restaurant_key_cache().clear()
+
+
+def time_requests(iterations, send, before=None):
+    latencies = []
+    query_counts = []
+    for i in range(iterations):
+        if before:
+            before()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = send(i)
+            latencies.append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 400:
+            raise RuntimeError(f'{response.status_code} from benchmark request: {response.content[:200]!r}')
+        query_counts.append(len(queries))
+    return summarize(latencies, query_counts)
+
+
+def client_for(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+    return client
+
+
+def benchmark_scale(name, iterations=50, seed=0, **overrides):
+    params = {**SCALES.get(name, {}), **overrides}
+    clear_caches()
+    data = generate_load_data(seed=seed, **params)
+
+    employee = client_for(User.objects.filter(is_staff=False).first())
+    admin = client_for(User.objects.create(username=f'bench-admin-{uuid.uuid4().hex[:8]}', is_staff=True))
+    voters = [client_for(user) for user in User.objects.bulk_create(
+        [User(username=f'bench-voter-{uuid.uuid4().hex[:12]}') for _ in range(iterations)])]
+    menu_ids = list(Menu.objects.filter(date=date.today()).values_list('id', flat=True))
+
+    endpoints = {
+        'vote_create': time_requests(iterations, lambda i: voters[i].post(
+            reverse('vote-list'), {'menu': menu_ids[i % len(menu_ids)]})),
+        'current_day_menu': time_requests(iterations, lambda i: employee.get(reverse('current_day_menu'))),
+        'current_day_menu_cold': time_requests(iterations, lambda i: employee.get(reverse('current_day_menu')),
+                                               before=clear_caches),
+        'current_results': time_requests(iterations, lambda i: employee.get(reverse('current_results'))),
+        'restaurants_v2_list': time_requests(iterations, lambda i: admin.get(reverse('menu-v2-list'))),
+    }
+    return {'scale': name, 'data': data, 'endpoints': endpoints}
@@ -0,0 +1,195 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from restaurants.models import Restaurant
+
+STATS_KEYS = {'hits': 'menus:stats:hits', 'misses': 'menus:stats:misses'}
+
+
+class DayVersion:
+    def __init__(self, name):
+        self.name = name
+
+    def _key(self, day):
+        return f'{self.name}:version:{day}'
+
+    def get(self, day):
+        cache = caches[settings.MENU_CACHE_ALIAS]
+        version = cache.get(self._key(day))
+        if version is None:
+            # Seed from the clock so a version lost to eviction never repeats an older one.
+            cache.add(self._key(day), int(time.time() * 1000), None)
+            version = cache.get(self._key(day))
+        return version
+
+    def bump(self, *days):
+        days = set(days)
+        self._bump(days)
+        # Bump again once the write is visible, so a reader that cached the old rows under
+        # the first bump is not trusted after commit.
+        if days and transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: self._bump(days))
+
+    def _bump(self, days):
+        cache = caches[settings.MENU_CACHE_ALIAS]
+        for day in days:
+            try:
+                cache.incr(self._key(day))
+            except ValueError:
+                cache.set(self._key(day), int(time.time() * 1000), None)
+
+    def etag(self, day):
+        return f'"{self.name}-{day}-{self.get(day)}"'
+
+
+class CombinedDayVersion:
+    def __init__(self, name, *versions):
+        self.name = name
+        self.versions = versions
+
+    def get(self, day):
+        return '.'.join(str(versions.get(day)) for versions in self.versions)
+
+    def etag(self, day):
+        return f'"{self.name}-{day}-{self.get(day)}"'
+
+
+menu_versions = DayVersion('menus')
+results_versions = DayVersion('results')
+# New ballots only bump ballot_versions; edits and deletes also bump ballot_resets so the
+# ranked tally is rebuilt instead of extended.
+ballot_versions = DayVersion('ballots')
+ballot_resets = DayVersion('ballot-resets')
+# Results list menu names, so menu edits change them as well as votes.
+current_results_versions = CombinedDayVersion('results', results_versions, menu_versions)
+ranked_results_versions = CombinedDayVersion('ranked', menu_versions, ballot_resets, ballot_versions)
+
+
+class MenuCache:
+    @staticmethod
+    def backend():
+        return caches[settings.MENU_CACHE_ALIAS]
+
+    @staticmethod
+    def version(day):
+        return menu_versions.get(day)
+
+    @staticmethod
+    def invalidate(*days):
+        menu_versions.bump(*days)
+
+    @staticmethod
+    def get_or_set(day, restaurant_id, build, fieldset=''):
+        cache = MenuCache.backend()
+        key = f"menus:{day}:{MenuCache.version(day)}:{restaurant_id or 'all'}:{fieldset}"
+        payload = cache.get(key)
+        if payload is not None:
+            MenuCache._count('hits')
+            return payload
+
+        MenuCache._count('misses')
+        payload = list(build())
+        cache.set(key, payload, settings.MENU_CACHE_TIMEOUT)
+        return payload
+
+    @staticmethod
+    def stats():
+        cache = MenuCache.backend()
+        hits = cache.get(STATS_KEYS['hits'], 0)
+        misses = cache.get(STATS_KEYS['misses'], 0)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else None,
+        }
+
+    @staticmethod
+    def _count(name):
+        cache = MenuCache.backend()
+        key = STATS_KEYS[name]
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+class RestaurantKeyCache:
+    MISSING = object()
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(api_key):
+        try:
+            return str(uuid.UUID(str(api_key)))
+        except ValueError:
+            return None
+
+    def get(self, api_key):
+        with self._lock:
+            entry = self._entries.get(api_key)
+            if entry is None:
+                return None
+            expires_at, restaurant = entry
+            if expires_at < time.monotonic():
+                del self._entries[api_key]
+                return None
+            self._entries.move_to_end(api_key)
+            return restaurant
+
+    def set(self, api_key, restaurant):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[api_key] = (time.monotonic() + self.ttl, restaurant)
+            self._entries.move_to_end(api_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def evict(self, restaurant_id, *api_keys):
+        keys = {self.normalize(api_key) for api_key in api_keys if api_key}
+        with self._lock:
+            for key, (_, restaurant) in list(self._entries.items()):
+                if key in keys or getattr(restaurant, 'pk', None) == restaurant_id:
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_restaurant_key_cache = None
+
+
+def restaurant_key_cache():
+    global _restaurant_key_cache
+    if _restaurant_key_cache is None:
+        _restaurant_key_cache = RestaurantKeyCache(settings.API_KEY_CACHE_SIZE, settings.API_KEY_CACHE_TTL)
+    return _restaurant_key_cache
+
+
+def get_restaurant_by_api_key(api_key):
+    key = RestaurantKeyCache.normalize(api_key)
+    if key is None:
+        raise Restaurant.DoesNotExist
+
+    cache = restaurant_key_cache()
+    restaurant = cache.get(key)
+    if restaurant is None:
+        restaurant = Restaurant.objects.filter(api_key=key).first() or RestaurantKeyCache.MISSING
+        cache.set(key, restaurant)
+    if restaurant is RestaurantKeyCache.MISSING:
+        raise Restaurant.DoesNotExist
+    return restaurant
@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    # Bounds the connections a worker holds open; idle ones are reused instead of reconnecting.
+    def __init__(self, size, timeout, check=None):
+        self.size = size
+        self.timeout = timeout
+        self.check = check
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle = deque()
+        self._in_use = 0
+        self._stats = {'checkouts': 0, 'connections_created': 0, 'connections_discarded': 0, 'timeouts': 0,
+                       'wait_ms_total': 0.0, 'wait_ms_max': 0.0}
+
+    def checkout(self, connect):
+        started = time.perf_counter()
+        acquired = self._slots.acquire(timeout=self.timeout)
+        waited = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._stats['wait_ms_total'] += waited
+            self._stats['wait_ms_max'] = max(self._stats['wait_ms_max'], waited)
+            if not acquired:
+                self._stats['timeouts'] += 1
+                raise PoolTimeout(f'No database connection became free within {self.timeout}s.')
+        try:
+            connection = self._reuse()
+            if connection is None:
+                connection = connect()
+                with self._lock:
+                    self._stats['connections_created'] += 1
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._stats['checkouts'] += 1
+            self._in_use += 1
+        return connection
+
+    def _reuse(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                connection = self._idle.pop()
+            if self.check is None or self.check(connection):
+                return connection
+            self._discard(connection)
+
+    def release(self, connection, reusable=True):
+        if reusable:
+            with self._lock:
+                self._idle.append(connection)
+        else:
+            self._discard(connection)
+        with self._lock:
+            self._in_use -= 1
+        self._slots.release()
+
+    def _discard(self, connection):
+        with self._lock:
+            self._stats['connections_discarded'] += 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for connection in idle:
+            self._discard(connection)
+
+    def stats(self):
+        with self._lock:
+            checkouts = self._stats['checkouts']
+            return {
+                **self._stats,
+                'wait_ms_total': round(self._stats['wait_ms_total'], 3),
+                'wait_ms_max': round(self._stats['wait_ms_max'], 3),
+                'wait_ms_mean': round(self._stats['wait_ms_total'] / checkouts, 3) if checkouts else None,
+                'size': self.size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def connection_pool(alias, size, timeout, check=None):
+    with _pools_lock:
+        if alias not in _pools:
+            _pools[alias] = ConnectionPool(size, timeout, check)
+        return _pools[alias]
+
+
+def close_pool(alias):
+    with _pools_lock:
+        pool = _pools.pop(alias, None)
+    if pool is not None:
+        pool.close()
+
+
+def pool_stats():
+    with _pools_lock:
+        pools = dict(_pools)
+    return {alias: pool.stats() for alias, pool in pools.items()}
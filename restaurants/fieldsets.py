@@ -0,0 +1,121 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def parse_fieldset(value):
+    if value is None:
+        return None
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def request_fieldset(request):
+    return {
+        'fields': parse_fieldset(request.query_params.get('fields')),
+        'expand': parse_fieldset(request.query_params.get('expand')),
+    }
+
+
+def fieldset_key(fieldset):
+    return ';'.join(f"{name}={','.join(sorted(value))}" for name, value in fieldset.items() if value is not None)
+
+
+def sparse_queryset(serializer, queryset, fieldset):
+    if fieldset.get('fields') is None and fieldset.get('expand') is None:
+        return queryset
+    return serializer.optimize_queryset(queryset)
+
+
+def split_paths(paths):
+    # ['id', 'dishes.name'] -> ({'id', 'dishes'}, {'dishes': ['name']})
+    top, nested = set(), {}
+    for path in paths:
+        name, _, rest = path.partition('.')
+        top.add(name)
+        if rest:
+            nested.setdefault(name, []).append(rest)
+    return top, nested
+
+
+class SparseFieldsetMixin:
+    # `fields` limits the output ("dishes.name" selects inside a nested serializer) and `expand`
+    # embeds the relations listed in Meta.expandable_fields.
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.apply_fieldset(fields, expand)
+
+    def apply_fieldset(self, fields=None, expand=None):
+        expand_top, expand_nested = split_paths(expand or [])
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        unknown = expand_top - set(expandable)
+        if unknown:
+            raise serializers.ValidationError({"error": f"Cannot expand: {', '.join(sorted(unknown))}."})
+        for name in sorted(expand_top):
+            serializer_class, options = expandable[name]
+            self.fields[name] = serializer_class(read_only=True, expand=expand_nested.get(name), **options)
+
+        if fields is None:
+            return
+        selected, nested = split_paths(fields)
+        unknown = selected - set(self.fields)
+        if unknown:
+            raise serializers.ValidationError({"error": f"Unknown fields: {', '.join(sorted(unknown))}."})
+        for name in list(self.fields):
+            if name not in selected:
+                self.fields.pop(name)
+        for name, subfields in nested.items():
+            child = getattr(self.fields[name], 'child', self.fields[name])
+            if not isinstance(child, SparseFieldsetMixin):
+                raise serializers.ValidationError({"error": f"Field '{name}' has no nested fields."})
+            child.apply_fieldset(subfields)
+
+    def optimize_queryset(self, queryset):
+        model = self.Meta.model
+        columns = {model._meta.pk.name}
+        prefetches = []
+        for field in self.fields.values():
+            if field.write_only:
+                continue
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                # Computed values (annotations, methods) may need any column.
+                return queryset
+            child = getattr(field, 'child', field)
+            if model_field.many_to_one or model_field.one_to_one:
+                columns.add(model_field.attname)
+            elif not model_field.is_relation:
+                columns.add(model_field.attname)
+            if model_field.is_relation and isinstance(child, SparseFieldsetMixin):
+                related = child.optimize_queryset(model_field.related_model._default_manager.all())
+                prefetches.append(Prefetch(field.source, queryset=related))
+        if prefetches:
+            queryset = queryset.prefetch_related(None).prefetch_related(*prefetches)
+        return queryset.only(*columns)
+
+
+class SparseFieldsetViewMixin:
+    def get_fieldset(self):
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in SAFE_METHODS:
+            return {}
+        return request_fieldset(request)
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.update(self.get_fieldset())
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        return self.sparse_queryset(super().get_queryset())
+
+    def sparse_queryset(self, queryset):
+        fieldset = self.get_fieldset()
+        if not fieldset:
+            return queryset
+        return sparse_queryset(self.get_serializer(), queryset, fieldset)
+
+    def fieldset_key(self):
+        return fieldset_key(self.get_fieldset())
@@ -0,0 +1,19 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+
+
+def _setup_worker():
+    import django
+
+    django.setup()
+
+
+def hash_passwords(passwords, workers):
+    # Password hashing is CPU bound, so large imports spread it over a process pool.
+    if workers <= 1 or len(passwords) < 2:
+        return [make_password(password) for password in passwords]
+
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_setup_worker) as pool:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from restaurants.views.v1.service import VoteTallyService
+
+
+class InProcessResultsBroker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._subscribers = set()
+
+    def version(self, day):
+        return self._versions.get(day, 0)
+
+    def publish(self, day):
+        with self._lock:
+            self._versions[day] = self._versions.get(day, 0) + 1
+        self._notify(day)
+
+    async def wait(self, day, seen_version, timeout):
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        subscriber = (loop, event, day)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        try:
+            if self.version(day) == seen_version:
+                try:
+                    await asyncio.wait_for(event.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+        return self.version(day)
+
+    def _notify(self, day):
+        with self._lock:
+            subscribers = [(loop, event) for loop, event, subscribed_day in self._subscribers if subscribed_day == day]
+        for loop, event in subscribers:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The subscriber's event loop is already closed.
+                pass
+
+
+# Publishers bump a counter in the shared cache; one poller per worker copies it into the
+# in-process versions, so idle subscribers never touch the cache or the database.
+class CacheResultsBroker(InProcessResultsBroker):
+    def __init__(self):
+        super().__init__()
+        self._poller = None
+
+    @staticmethod
+    def _key(day):
+        return f'live-results:{day}'
+
+    def publish(self, day):
+        cache = caches[settings.LIVE_RESULTS_CACHE_ALIAS]
+        cache.add(self._key(day), 0, None)
+        try:
+            cache.incr(self._key(day))
+        except ValueError:
+            cache.set(self._key(day), 1, None)
+
+    async def wait(self, day, seen_version, timeout):
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.ensure_future(self._poll())
+        return await super().wait(day, seen_version, timeout)
+
+    async def _poll(self):
+        cache = caches[settings.LIVE_RESULTS_CACHE_ALIAS]
+        await asyncio.sleep(0)
+        while True:
+            with self._lock:
+                days = {day for _, _, day in self._subscribers}
+            if not days:
+                return
+            for day in days:
+                version = await cache.aget(self._key(day), 0)
+                with self._lock:
+                    changed = self._versions.get(day) != version
+                    self._versions[day] = version
+                if changed:
+                    self._notify(day)
+            await asyncio.sleep(settings.LIVE_RESULTS_INTERVAL)
+
+
+_broker = None
+
+
+def results_broker():
+    global _broker
+    if _broker is None:
+        _broker = import_string(settings.LIVE_RESULTS_BACKEND)()
+    return _broker
+
+
+_snapshots = {}
+
+
+async def results_snapshot(day, version):
+    # Subscribers woken by the same update share one tally query.
+    loop = asyncio.get_running_loop()
+    cached = _snapshots.get(day)
+    if cached is None or cached[0] != version or cached[1] is not loop:
+        task = loop.create_task(sync_to_async(VoteTallyService.current_results)(day))
+        cached = (version, loop, task)
+        _snapshots.clear()
+        _snapshots[day] = cached
+    return await asyncio.shield(cached[2])
+
+
+async def stream_results(day):
+    # Streams end at midnight and after LIVE_RESULTS_MAX_AGE, since the ASGI handler does not notice
+    # closed clients; `retry` tells EventSource how soon to reconnect for the current day.
+    broker = results_broker()
+    version = None
+    retry = int(settings.LIVE_RESULTS_RETRY * 1000)
+    deadline = time.monotonic() + settings.LIVE_RESULTS_MAX_AGE
+    while date.today() == day:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        latest = await broker.wait(day, version, min(settings.LIVE_RESULTS_KEEPALIVE, remaining))
+        if latest == version:
+            yield ': keepalive\n\n'
+            continue
+
+        version = latest
+        results = await results_snapshot(day, version)
+        yield f'event: results\nid: {version}\nretry: {retry}\ndata: {json.dumps(results)}\n\n'
+        # Votes arriving during the interval are coalesced into the next update.
+        await asyncio.sleep(settings.LIVE_RESULTS_INTERVAL)
@@ -0,0 +1,88 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.db import transaction
+
+from restaurants.cache import menu_versions, results_versions
+from restaurants.models import Restaurant, Dish, Menu, Vote
+from restaurants.views.v1.service import VoteTallyService
+
+CUISINES = ['Italian', 'Thai', 'Georgian', 'Mexican', 'Indian', 'Japanese', 'Greek', 'Lebanese']
+DISH_WORDS = ['Soup', 'Salad', 'Curry', 'Pasta', 'Bowl', 'Wrap', 'Stew', 'Pie', 'Noodles', 'Risotto']
+USERNAME_PREFIX = 'load-user-'
+
+
+def generate_load_data(seed=0, restaurants=10, dishes_per_restaurant=30, menus_per_day=2, days=30, employees=200,
+                       turnout=0.8, dishes_per_menu=4):
+    rng = random.Random(seed)
+    today = date.today()
+    days_range = [today - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+
+    with transaction.atomic():
+        restaurant_objs = Restaurant.objects.bulk_create([
+            Restaurant(name=f"{rng.choice(CUISINES)} Place {i}", description=f"Synthetic restaurant {i}")
+            for i in range(restaurants)
+        ])
+
+        dishes = Dish.objects.bulk_create([
+            Dish(restaurant=restaurant, name=f"{rng.choice(DISH_WORDS)} #{j}", description=f"Synthetic dish {j}",
+                 price=Decimal(rng.randint(300, 2500)) / 100)
+            for restaurant in restaurant_objs
+            for j in range(dishes_per_restaurant)
+        ], batch_size=1000)
+        dishes_by_restaurant = {}
+        for dish in dishes:
+            dishes_by_restaurant.setdefault(dish.restaurant_id, []).append(dish.id)
+
+        menus = Menu.objects.bulk_create([
+            Menu(restaurant=restaurant, date=day, name=f"Menu {k + 1}")
+            for day in days_range
+            for restaurant in restaurant_objs
+            for k in range(menus_per_day)
+        ], batch_size=1000)
+        Menu.dishes.through.objects.bulk_create([
+            Menu.dishes.through(menu_id=menu.id, dish_id=dish_id)
+            for menu in menus
+            for dish_id in rng.sample(dishes_by_restaurant[menu.restaurant_id],
+                                      min(dishes_per_menu, dishes_per_restaurant))
+        ], batch_size=1000)
+
+        # Hashing one password for every synthetic employee keeps generation fast.
+        password = make_password('password123')
+        offset = User.objects.filter(username__startswith=USERNAME_PREFIX).count()
+        users = User.objects.bulk_create([
+            User(username=f"{USERNAME_PREFIX}{offset + i}", password=password) for i in range(employees)
+        ], batch_size=1000)
+        group, _ = Group.objects.get_or_create(name='Employee')
+        User.groups.through.objects.bulk_create([
+            User.groups.through(user_id=user.id, group_id=group.id) for user in users
+        ], batch_size=1000)
+
+        menus_by_day = {}
+        for menu in menus:
+            menus_by_day.setdefault(menu.date, []).append(menu)
+        votes = [
+            Vote(user=user, menu=menu, date=menu.date)
+            for day in days_range
+            for user in users
+            if rng.random() < turnout
+            for menu in [rng.choice(menus_by_day[day])]
+        ]
+        Vote.objects.bulk_create(votes, batch_size=5000)
+
+        # bulk_create skips the signals that keep tallies and cache versions current.
+        for day in days_range:
+            VoteTallyService.rebuild(day)
+        menu_versions.bump(*days_range)
+        results_versions.bump(*days_range)
+
+    return {
+        'restaurants': len(restaurant_objs),
+        'dishes': len(dishes),
+        'menus': len(menus),
+        'employees': len(users),
+        'votes': len(votes),
+    }
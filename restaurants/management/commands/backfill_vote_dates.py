@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery
+
+from restaurants.models import Menu, Vote
+
+
+class Command(BaseCommand):
+    help = 'Copy menu dates onto votes that have no date yet, in small batches that keep the table writable.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between batches.')
+
+    def handle(self, *args, **options):
+        menu_date = Subquery(Menu.objects.filter(id=OuterRef('menu_id')).values('date')[:1])
+        last_id = 0
+        total = 0
+        while True:
+            ids = list(Vote.objects.filter(id__gt=last_id, date__isnull=True).order_by('id').values_list(
+                'id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            total += Vote.objects.filter(id__in=ids).update(date=menu_date)
+            last_id = ids[-1]
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(f'Backfilled the date of {total} votes.'))
@@ -0,0 +1,62 @@
+import json
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, \
+    teardown_test_environment
+
+from restaurants.benchmarks import SCALES, benchmark_scale
+
+
+class Command(BaseCommand):
+    help = ('Time the key endpoints against synthetic data at several scales, on a throwaway test database, '
+            'and print the latency percentiles and query counts as JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='small,medium', help=f"Comma-separated from: {', '.join(SCALES)}.")
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        scales = [scale.strip() for scale in options['scales'].split(',') if scale.strip()]
+        unknown = set(scales) - set(SCALES)
+        if unknown:
+            raise CommandError(f"Unknown scales: {', '.join(sorted(unknown))}")
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            results = []
+            for scale in scales:
+                call_command('flush', interactive=False, verbosity=0)
+                self.stderr.write(f'Benchmarking {scale} scale...')
+                results.append(benchmark_scale(scale, iterations=options['iterations'], seed=options['seed']))
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'commit': self.git_commit(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'iterations': options['iterations'],
+            'seed': options['seed'],
+            'scales': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as out:
+                out.write(output + '\n')
+        else:
+            sys.stdout.write(output + '\n')
+
+    @staticmethod
+    def git_commit():
+        try:
+            return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
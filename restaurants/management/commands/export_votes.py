@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+
+from restaurants.views.v1.service import VoteExportService
+
+
+class Command(BaseCommand):
+    help = 'Stream the vote history as CSV or NDJSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', choices=sorted(VoteExportService.FORMATS), default='csv')
+        parser.add_argument('--date-from', help='First menu day to export (YYYY-MM-DD).')
+        parser.add_argument('--date-to', help='Last menu day to export (YYYY-MM-DD).')
+        parser.add_argument('--restaurant', help='Only export votes for this restaurant id.')
+        parser.add_argument('--file', help='Write to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        try:
+            filters = VoteExportService.parse_filters({
+                'date_from': options['date_from'],
+                'date_to': options['date_to'],
+                'restaurant': options['restaurant'],
+            })
+            rows = VoteExportService.get_rows(**filters)
+        except serializers.ValidationError as exc:
+            raise CommandError(exc.detail['error'])
+
+        lines = VoteExportService.stream(rows, options['output'])
+        if options['file']:
+            with open(options['file'], 'w', newline='') as out:
+                out.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
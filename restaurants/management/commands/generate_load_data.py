@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from restaurants.loadgen import generate_load_data
+
+
+class Command(BaseCommand):
+    help = 'Generate reproducible synthetic restaurants, dishes, menus, employees and votes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--restaurants', type=int, default=10)
+        parser.add_argument('--dishes-per-restaurant', type=int, default=30)
+        parser.add_argument('--menus-per-day', type=int, default=2, help='Menus per restaurant and day.')
+        parser.add_argument('--days', type=int, default=30, help='Days of menus, ending today.')
+        parser.add_argument('--employees', type=int, default=200)
+        parser.add_argument('--turnout', type=float, default=0.8, help='Share of employees voting each day.')
+
+    def handle(self, *args, **options):
+        counts = generate_load_data(
+            seed=options['seed'],
+            restaurants=options['restaurants'],
+            dishes_per_restaurant=options['dishes_per_restaurant'],
+            menus_per_day=options['menus_per_day'],
+            days=options['days'],
+            employees=options['employees'],
+            turnout=options['turnout'],
+        )
+        summary = ', '.join(f'{count} {name}' for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f'Generated {summary}.'))
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from restaurants.schema import write_schemas
+
+
+class Command(BaseCommand):
+    help = 'Write the v1 and v2 OpenAPI schemas (JSON and YAML) to OPENAPI_SCHEMA_DIR.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-dir', help='Directory to write to; defaults to OPENAPI_SCHEMA_DIR.')
+
+    def handle(self, *args, **options):
+        directory = options['output_dir'] or settings.OPENAPI_SCHEMA_DIR
+        if not directory:
+            raise CommandError('Set OPENAPI_SCHEMA_DIR or pass --output-dir.')
+        for path in write_schemas(directory):
+            self.stdout.write(path)
@@ -0,0 +1,30 @@
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from restaurants.views.v1.service import EmployeeImportService
+
+
+class Command(BaseCommand):
+    help = 'Create employees from a CSV or JSON file with username, password and role columns.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file, or JSON file holding an array of employees.')
+        parser.add_argument('--workers', type=int, help='Processes used to hash passwords.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            with open(path, newline='', encoding='utf-8-sig') as source:
+                if path.endswith('.json'):
+                    rows = json.load(source)
+                else:
+                    rows = list(csv.DictReader(source))
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Cannot read {path}: {exc}')
+
+        report = EmployeeImportService.import_employees(rows, workers=options['workers'])
+        for error in report['errors']:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(f"Created {report['created']} employees."))
@@ -0,0 +1,54 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from restaurants.partitioning import VotePartitioner, months_to_archive
+
+
+class Command(BaseCommand):
+    help = ('Keep restaurants_vote partitioned by month (PostgreSQL only): create partitions ahead of time '
+            'and detach or drop the ones older than the retention window.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--convert', action='store_true',
+                            help='Convert the existing vote table into a partitioned one (locks it while copying).')
+        parser.add_argument('--ahead', type=int, default=settings.VOTE_PARTITION_MONTHS_AHEAD,
+                            help='Months after the current one to create partitions for.')
+        parser.add_argument('--retain', type=int, default=settings.VOTE_PARTITION_RETAIN_MONTHS,
+                            help='Months before the current one to keep attached; 0 keeps everything.')
+        parser.add_argument('--drop', action='store_true',
+                            help='Drop old partitions instead of keeping them as restaurants_vote_archive_YYYY_MM.')
+        parser.add_argument('--force', action='store_true',
+                            help='Archive months even if some of their days are not rolled up yet.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Vote partitioning requires PostgreSQL.')
+
+        partitioner = VotePartitioner()
+        today = date.today()
+        if not partitioner.is_partitioned():
+            if not options['convert']:
+                raise CommandError('The vote table is not partitioned yet; run with --convert first.')
+            try:
+                partitioner.convert(options['ahead'])
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            self.stdout.write('Converted the vote table to monthly partitions.')
+
+        for month in partitioner.ensure_partitions(today, options['ahead']):
+            self.stdout.write(f'Created the partition for {month:%Y-%m}.')
+
+        if not options['retain']:
+            return
+        for month in months_to_archive(partitioner.partitions(), today, options['retain']):
+            # Rollups are what reports read once the votes are gone.
+            pending = partitioner.unrolled_days(month)
+            if pending and not options['force']:
+                self.stdout.write(self.style.WARNING(
+                    f'Skipped {month:%Y-%m}: {len(pending)} days are not rolled up yet (run rollup_votes).'))
+                continue
+            partitioner.archive(month, drop=options['drop'])
+            self.stdout.write(f"{'Dropped' if options['drop'] else 'Archived'} the partition for {month:%Y-%m}.")
@@ -0,0 +1,41 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+
+from restaurants.views.v1.service import VoteTallyService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild or verify the per-menu vote tallies from the raw Vote rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Only process menus of this day (YYYY-MM-DD).')
+        parser.add_argument('--verify', action='store_true',
+                            help='Report mismatching tallies instead of rebuilding them.')
+
+    def handle(self, *args, **options):
+        day = None
+        if options['date']:
+            try:
+                day = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError(f"Invalid date: {options['date']}")
+
+        if options['verify']:
+            try:
+                mismatches = VoteTallyService.verify(day)
+            except serializers.ValidationError as exc:
+                raise CommandError(exc.detail['error'])
+            for menu_id, expected, actual in mismatches:
+                self.stdout.write(f"Menu {menu_id}: expected {expected} votes, tally has {actual}")
+            if mismatches:
+                raise CommandError(f"{len(mismatches)} tallies are out of date.")
+            self.stdout.write(self.style.SUCCESS('All vote tallies are up to date.'))
+            return
+
+        try:
+            rebuilt = VoteTallyService.rebuild(day)
+        except serializers.ValidationError as exc:
+            raise CommandError(exc.detail['error'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rebuilt} vote tallies.'))
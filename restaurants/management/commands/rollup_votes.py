@@ -0,0 +1,37 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework import serializers
+
+from restaurants.partitioning import VotePartitioner
+from restaurants.views.v1.service import VoteRollupService
+
+
+class Command(BaseCommand):
+    help = 'Roll up votes per restaurant, menu and day for every closed day that is not rolled up yet.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--until', help='Last day to roll up (YYYY-MM-DD). Defaults to yesterday.')
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Drop existing rollups up to --until and recompute them.')
+
+    def handle(self, *args, **options):
+        until = None
+        if options['until']:
+            try:
+                until = date.fromisoformat(options['until'])
+            except ValueError:
+                raise CommandError(f"Invalid date: {options['until']}")
+
+        keep_months = []
+        partitioner = VotePartitioner() if connection.vendor == 'postgresql' else None
+        if options['rebuild'] and partitioner and partitioner.is_partitioned():
+            keep_months = partitioner.archived_months()
+            for month in keep_months:
+                self.stdout.write(f'Kept the rollups of {month:%Y-%m}; its votes are archived.')
+        try:
+            days = VoteRollupService.rollup(until=until, rebuild=options['rebuild'], keep_months=keep_months)
+        except serializers.ValidationError as exc:
+            raise CommandError(exc.detail['error'])
+        self.stdout.write(self.style.SUCCESS(f'Rolled up {len(days)} days.'))
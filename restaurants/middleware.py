@@ -1,3 +1,18 @@
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from restaurants.routers import pin_to_primary, pinned_to_primary, replica_reads
+from restaurants.timing import SerializationTimer, serialization_timer
+
+logger = logging.getLogger('restaurants.performance')
+
+
 class CheckAppVersionMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -12,3 +27,102 @@ class CheckAppVersionMiddleware:
 
         response = self.get_response(request)
         return response
+
+
+class ReplicaRoutingMiddleware:
+    # Safe requests read from the replicas unless the same client wrote recently, so users
+    # always see their own vote; everything else stays on the primary.
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        safe = request.method in ('GET', 'HEAD', 'OPTIONS')
+        token = replica_reads.set(safe and not pinned_to_primary(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_reads.reset(token)
+        if not safe:
+            pin_to_primary(request, response)
+        return response
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slow_queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.count += 1
+            self.duration += elapsed
+            if settings.PERF_SLOW_QUERY_LOG_COUNT and elapsed >= settings.PERF_SLOW_QUERY_THRESHOLD_MS:
+                self.slow_queries.append((elapsed, sql))
+
+
+class PerformanceInstrumentationMiddleware:
+    def __init__(self, get_response):
+        if not settings.PERF_INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        timer = SerializationTimer()
+        request._render_timing = [None, None]
+        started = time.perf_counter()
+        token = serialization_timer.set(timer)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(recorder))
+                response = self.get_response(request)
+        finally:
+            serialization_timer.reset(token)
+        total = (time.perf_counter() - started) * 1000
+
+        render_started, render_finished = request._render_timing
+        render = (render_finished - render_started) * 1000 if render_finished else 0.0
+        response['Server-Timing'] = ', '.join([
+            f'total;dur={total:.1f}',
+            f'db;dur={recorder.duration:.1f};desc="{recorder.count} queries"',
+            f'serialize;dur={timer.duration:.1f}',
+            f'render;dur={render:.1f}',
+        ])
+        self.log(request, response, total, timer.duration, render, recorder)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; time the JSON encoding step.
+        request._render_timing[0] = time.perf_counter()
+
+        def finished(rendered):
+            request._render_timing[1] = time.perf_counter()
+
+        response.add_post_render_callback(finished)
+        return response
+
+    def log(self, request, response, total, serialize, render, recorder):
+        resolver_match = getattr(request, 'resolver_match', None)
+        slow_queries = sorted(recorder.slow_queries, reverse=True)[:settings.PERF_SLOW_QUERY_LOG_COUNT]
+        logger.info(json.dumps({
+            'view': resolver_match.view_name if resolver_match else None,
+            'app_version': getattr(request, 'app_version', None),
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total, 2),
+            'db_ms': round(recorder.duration, 2),
+            'db_queries': recorder.count,
+            'serialize_ms': round(serialize, 2),
+            'render_ms': round(render, 2),
+            'slow_queries': [{'ms': round(elapsed, 2), 'sql': sql} for elapsed, sql in slow_queries],
+        }))
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.16 on 2026-10-18 06:23
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def populate_tallies(apps, schema_editor):
+    Vote = apps.get_model('restaurants', 'Vote')
+    VoteTally = apps.get_model('restaurants', 'VoteTally')
+    counts = Vote.objects.values('menu_id', 'menu__date').annotate(total=Count('id'))
+    VoteTally.objects.bulk_create(
+        [VoteTally(menu_id=row['menu_id'], date=row['menu__date'], count=row['total']) for row in counts],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0003_alter_restaurant_api_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VoteTally',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(db_index=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('menu', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='tally', to='restaurants.menu')),
+            ],
+        ),
+        migrations.RunPython(populate_tallies, migrations.RunPython.noop),
+    ]
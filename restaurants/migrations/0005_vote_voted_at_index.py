@@ -0,0 +1,20 @@
+# Generated by Django 4.2.16 on 2026-10-18 06:29
+
+from django.db import migrations, models
+
+from restaurants.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('restaurants', '0004_vote_tally'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='vote',
+            index=models.Index(fields=['-voted_at', '-id'], name='vote_voted_at_id_idx'),
+        ),
+    ]
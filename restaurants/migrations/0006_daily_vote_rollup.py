@@ -0,0 +1,36 @@
+# Generated by Django 4.2.16 on 2026-10-18 06:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0005_vote_voted_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RolledUpDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('rolled_up_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyVoteRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('votes', models.PositiveIntegerField(default=0)),
+                ('menu', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vote_rollups', to='restaurants.menu')),
+                ('restaurant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vote_rollups', to='restaurants.restaurant')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date', 'restaurant'], name='rollup_date_restaurant_idx')],
+                'unique_together': {('date', 'menu')},
+            },
+        ),
+    ]
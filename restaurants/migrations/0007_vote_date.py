@@ -0,0 +1,29 @@
+# Generated by Django 4.2.16 on 2026-10-18 06:33
+
+from django.db import migrations, models
+
+from restaurants.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('restaurants', '0006_daily_vote_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vote',
+            name='date',
+            field=models.DateField(null=True),
+        ),
+        AddIndexConcurrently(
+            model_name='menu',
+            index=models.Index(fields=['date', 'restaurant'], name='menu_date_restaurant_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='vote',
+            index=models.Index(fields=['date', 'menu'], name='vote_date_menu_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.16 on 2026-10-18 06:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('restaurants', '0007_vote_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankedBallot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('ranking', models.JSONField()),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+                ('submitted_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ranked_ballots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date', 'id'], name='ballot_date_id_idx')],
+                'unique_together': {('user', 'date')},
+            },
+        ),
+    ]
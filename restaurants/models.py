@@ -33,6 +33,7 @@ class Menu(models.Model):
 
     class Meta:
         unique_together = ('restaurant', 'date', 'name')
+        indexes = [models.Index(fields=['date', 'restaurant'], name='menu_date_restaurant_idx')]
 
     def __str__(self):
         return f"{self.name} for {self.date} at {self.restaurant.name}"
@@ -42,9 +43,67 @@ class Vote(models.Model):
     user = models.ForeignKey(User, related_name='votes', on_delete=models.CASCADE)
     menu = models.ForeignKey(Menu, related_name='votes', on_delete=models.CASCADE)
     voted_at = models.DateTimeField(auto_now_add=True)
+    # Copy of menu.date so day-scoped queries do not have to join menus.
+    date = models.DateField(null=True)
 
     class Meta:
         unique_together = ('user', 'menu')
+        indexes = [
+            models.Index(fields=['-voted_at', '-id'], name='vote_voted_at_id_idx'),
+            models.Index(fields=['date', 'menu'], name='vote_date_menu_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.menu_id and (self.date is None or Vote.menu.is_cached(self)):
+            self.date = self.menu.date
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.user.username} voted for {self.menu.restaurant.name} on {self.menu.date}"
+
+
+class VoteTally(models.Model):
+    menu = models.OneToOneField(Menu, related_name='tally', on_delete=models.CASCADE)
+    date = models.DateField(db_index=True)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.menu.name} on {self.date}: {self.count}"
+
+
+class DailyVoteRollup(models.Model):
+    date = models.DateField()
+    restaurant = models.ForeignKey(Restaurant, related_name='vote_rollups', on_delete=models.CASCADE)
+    menu = models.ForeignKey(Menu, related_name='vote_rollups', on_delete=models.CASCADE)
+    votes = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('date', 'menu')
+        indexes = [models.Index(fields=['date', 'restaurant'], name='rollup_date_restaurant_idx')]
+
+    def __str__(self):
+        return f"{self.menu.name} on {self.date}: {self.votes}"
+
+
+class RolledUpDay(models.Model):
+    date = models.DateField(unique=True)
+    rolled_up_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return str(self.date)
+
+
+class RankedBallot(models.Model):
+    user = models.ForeignKey(User, related_name='ranked_ballots', on_delete=models.CASCADE)
+    date = models.DateField()
+    # Menu ids, most preferred first.
+    ranking = models.JSONField()
+    weight = models.PositiveSmallIntegerField(default=1)
+    submitted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('user', 'date')
+        indexes = [models.Index(fields=['date', 'id'], name='ballot_date_id_idx')]
+
+    def __str__(self):
+        return f"{self.user.username} ranked {self.ranking} on {self.date}"
@@ -0,0 +1,23 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class PageLimitPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'limit'
+    max_page_size = 500
+
+    def get_page_size(self, request):
+        # Listings stay unpaginated unless the client asks for a page or a limit.
+        if self.page_query_param not in request.query_params and self.page_size_query_param not in request.query_params:
+            return None
+        return super().get_page_size(request)
+
+
+class KeysetPagination(CursorPagination):
+    ordering = '-id'
+    page_size_query_param = 'limit'
+    max_page_size = 500
+
+
+class VoteKeysetPagination(KeysetPagination):
+    ordering = ('-voted_at', '-id')
@@ -0,0 +1,162 @@
+import re
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+
+from restaurants.models import Menu, RolledUpDay, Vote
+from restaurants.views.v1.service import VoteRollupService
+
+# Optional PostgreSQL mode: restaurants_vote becomes a table partitioned by month on the menu
+# date, so the indexes behind today's unique (user, menu) check only cover the current month.
+
+PARTITION_SUFFIX = re.compile(r'_p(\d{4})_(\d{2})$')
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def months_between(first, last):
+    month = month_start(first)
+    while month <= last:
+        yield month
+        month = add_months(month, 1)
+
+
+def partition_name(table, month):
+    return f'{table}_p{month:%Y_%m}'
+
+
+def archive_name(table, month):
+    return f'{table}_archive_{month:%Y_%m}'
+
+
+def partition_month(name):
+    match = PARTITION_SUFFIX.search(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def months_to_create(today, ahead):
+    return list(months_between(today, add_months(month_start(today), ahead)))
+
+
+def months_to_archive(months, today, retain):
+    cutoff = add_months(month_start(today), -retain)
+    return sorted(month for month in months if month < cutoff)
+
+
+class VotePartitioner:
+    def __init__(self, using=connection):
+        self.connection = using
+        self.table = Vote._meta.db_table
+
+    def quote(self, name):
+        return self.connection.ops.quote_name(name)
+
+    def execute(self, sql, params=None):
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall() if cursor.description else None
+
+    def is_partitioned(self):
+        rows = self.execute(
+            "SELECT c.relkind FROM pg_class c WHERE c.relname = %s AND pg_table_is_visible(c.oid)", [self.table])
+        return bool(rows) and rows[0][0] == 'p'
+
+    def partitions(self):
+        rows = self.execute(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class child ON child.oid = i.inhrelid JOIN pg_class parent ON parent.oid = i.inhparent "
+            "WHERE parent.relname = %s AND pg_table_is_visible(parent.oid)", [self.table])
+        return {partition_month(name): name for (name,) in rows if partition_month(name)}
+
+    def convert(self, ahead):
+        if self.execute(f'SELECT 1 FROM {self.quote(self.table)} WHERE date IS NULL LIMIT 1'):
+            raise ValueError('Some votes have no date; run backfill_vote_dates first.')
+
+        table = self.quote(self.table)
+        old = self.quote(f'{self.table}_unpartitioned')
+        sequence = self.quote(f'{self.table}_partitioned_id_seq')
+        with transaction.atomic(using=self.connection.alias):
+            self.execute(f'LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE')
+            first = self.execute(f'SELECT MIN(date) FROM {table}')[0][0] or date.today()
+            self.execute(f'ALTER TABLE {table} RENAME TO {old}')
+            self.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE (date)')
+            self.execute(f'ALTER TABLE {table} ALTER COLUMN date SET NOT NULL')
+            self.execute(f'CREATE SEQUENCE {sequence}')
+            self.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+            self.execute(f'ALTER SEQUENCE {sequence} OWNED BY {table}.id')
+            self.execute(f"SELECT setval('{sequence}', COALESCE(MAX(id), 0) + 1, false) FROM {old}")
+
+            self.execute(f'CREATE TABLE {self.quote(self.table + "_default")} PARTITION OF {table} DEFAULT')
+            for month in months_between(first, add_months(month_start(date.today()), ahead)):
+                self.create_partition(month)
+            self.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+            self.execute(f'DROP TABLE {old}')
+
+            # Unique constraints on a partitioned table must include the partition key; a menu
+            # belongs to a single day, so (user, menu, date) is as strict as (user, menu).
+            self.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id, date)')
+            self.execute(f'ALTER TABLE {table} ADD CONSTRAINT {self.quote(self.table + "_user_menu_date_uniq")} '
+                         f'UNIQUE (user_id, menu_id, date)')
+            for column, model in (('user_id', User), ('menu_id', Menu)):
+                self.execute(f'ALTER TABLE {table} ADD FOREIGN KEY ({column}) '
+                             f'REFERENCES {self.quote(model._meta.db_table)} (id) DEFERRABLE INITIALLY DEFERRED')
+            self.execute(f'CREATE INDEX {self.quote(self.table + "_menu_id")} ON {table} (menu_id)')
+            self.execute(f'CREATE INDEX vote_voted_at_id_idx ON {table} (voted_at DESC, id DESC)')
+            self.execute(f'CREATE INDEX vote_date_menu_idx ON {table} (date, menu_id)')
+
+    def create_partition(self, month):
+        table = self.quote(self.table)
+        default = self.quote(self.table + '_default')
+        partition = self.quote(partition_name(self.table, month))
+        bounds = [month, add_months(month, 1)]
+        with transaction.atomic(using=self.connection.alias):
+            # Rows for this month that landed in the default partition have to move first.
+            stray = self.execute(f'SELECT 1 FROM {default} WHERE date >= %s AND date < %s LIMIT 1', bounds)
+            if stray:
+                self.execute(f'ALTER TABLE {table} DETACH PARTITION {default}')
+            self.execute(f'CREATE TABLE {partition} PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)', bounds)
+            if stray:
+                self.execute(f'INSERT INTO {partition} SELECT * FROM {default} WHERE date >= %s AND date < %s',
+                             bounds)
+                self.execute(f'DELETE FROM {default} WHERE date >= %s AND date < %s', bounds)
+                self.execute(f'ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT')
+
+    def ensure_partitions(self, today, ahead):
+        existing = self.partitions()
+        created = [month for month in months_to_create(today, ahead) if month not in existing]
+        for month in created:
+            self.create_partition(month)
+        return created
+
+    def unrolled_days(self, month):
+        end = add_months(month, 1)
+        return [day for day in VoteRollupService.pending_days(end) if month <= day < end]
+
+    def archived_months(self):
+        # Rolled-up months without an attached partition: their rollups have outlived the votes.
+        attached = self.partitions()
+        return [month for month in RolledUpDay.objects.dates('date', 'month') if month not in attached]
+
+    def archive(self, month, drop=False):
+        table = self.quote(self.table)
+        partition = self.quote(self.partitions()[month])
+        with transaction.atomic(using=self.connection.alias):
+            self.execute(f'ALTER TABLE {table} DETACH PARTITION {partition}')
+            if drop:
+                self.execute(f'DROP TABLE {partition}')
+                return
+            # A detached partition keeps its own copies of the user and menu foreign keys, which
+            # would stop those users and menus from being deleted.
+            foreign_keys = self.execute(
+                "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'", [partition])
+            for (name,) in foreign_keys:
+                self.execute(f'ALTER TABLE {partition} DROP CONSTRAINT {self.quote(name)}')
+            self.execute(f'ALTER TABLE {partition} RENAME TO {self.quote(archive_name(self.table, month))}')
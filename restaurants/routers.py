@@ -0,0 +1,76 @@
+import hashlib
+import itertools
+import threading
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+replica_reads = ContextVar('replica_reads', default=False)
+STICKY_COOKIE = 'db_primary'
+
+
+class ReplicaSelector:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self._last_used = {}
+
+    def choose(self, replicas):
+        if settings.DATABASE_REPLICA_SELECTION == 'least_recent':
+            with self._lock:
+                tick = next(self._counter)
+                alias = min(replicas, key=lambda replica: self._last_used.get(replica, -1))
+                self._last_used[alias] = tick
+                return alias
+        return replicas[next(self._counter) % len(replicas)]
+
+
+class ReplicaRouter:
+    def __init__(self):
+        self.selector = ReplicaSelector()
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        # Reads inside a transaction on the primary must see its uncommitted writes.
+        if not replicas or not replica_reads.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return self.selector.choose(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+def sticky_key(request):
+    credentials = request.headers.get('Authorization') or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credentials:
+        return None
+    return 'db-sticky:' + hashlib.sha256(credentials.encode()).hexdigest()
+
+
+def pin_to_primary(request, response):
+    seconds = settings.DATABASE_REPLICA_STICKY_SECONDS
+    if not seconds:
+        return
+    # The signed cookie pins the client on every worker; the cache also covers clients that
+    # drop cookies, but only when DATABASE_REPLICA_CACHE_ALIAS is shared between workers.
+    response.set_signed_cookie(STICKY_COOKIE, '1', salt=STICKY_COOKIE, max_age=seconds, httponly=True,
+                               samesite='Lax')
+    key = sticky_key(request)
+    if key:
+        caches[settings.DATABASE_REPLICA_CACHE_ALIAS].set(key, True, seconds)
+
+
+def pinned_to_primary(request):
+    seconds = settings.DATABASE_REPLICA_STICKY_SECONDS
+    if request.get_signed_cookie(STICKY_COOKIE, None, salt=STICKY_COOKIE, max_age=seconds):
+        return True
+    key = sticky_key(request)
+    return bool(key) and caches[settings.DATABASE_REPLICA_CACHE_ALIAS].get(key, False)
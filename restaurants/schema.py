@@ -0,0 +1,104 @@
+import hashlib
+import os
+import threading
+
+from django.conf import settings
+
+# drf_yasg is only imported once a schema is generated or a UI page is rendered.
+
+SCHEMA_VERSIONS = {
+    'v1': "API for lunch decision making - Version 1",
+    'v2': "API for lunch decision making - Version 2",
+}
+FORMATS = {
+    'json': 'application/json',
+    'yaml': 'application/yaml',
+}
+
+
+def auto_schema(**overrides):
+    # Equivalent of drf_yasg.utils.swagger_auto_schema for plain view methods.
+    def decorator(view_method):
+        view_method._swagger_auto_schema = {key: value for key, value in overrides.items() if value is not None}
+        return view_method
+    return decorator
+
+
+def schema_info(version):
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title="Lunch Decider API",
+        default_version=version,
+        description=SCHEMA_VERSIONS[version],
+        terms_of_service="https://www.google.com/policies/terms/",
+        contact=openapi.Contact(email="contact@lunchdecider.local"),
+        license=openapi.License(name="BSD License"),
+    )
+
+
+def generate_schema(version, fmt):
+    from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+    from drf_yasg.generators import OpenAPISchemaGenerator
+
+    generator = OpenAPISchemaGenerator(schema_info(version), version, url=settings.OPENAPI_SCHEMA_URL)
+    schema = generator.get_schema(request=None, public=True)
+    codec = OpenAPICodecYaml if fmt == 'yaml' else OpenAPICodecJson
+    return codec(validators=[]).encode(schema)
+
+
+def schema_path(directory, version, fmt):
+    return os.path.join(directory, f'{version}.{fmt}')
+
+
+class SchemaDocument:
+    def __init__(self, content):
+        self.content = content
+        self.etag = f'"schema-{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+class SchemaStore:
+    # Documents come from OPENAPI_SCHEMA_DIR when the management command wrote them there,
+    # otherwise they are generated on first use; either way they are kept in memory.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._documents = {}
+
+    def get(self, version, fmt):
+        key = (version, fmt)
+        document = self._documents.get(key)
+        if document is None:
+            with self._lock:
+                document = self._documents.get(key)
+                if document is None:
+                    document = SchemaDocument(self._load(version, fmt))
+                    self._documents[key] = document
+        return document
+
+    @staticmethod
+    def _load(version, fmt):
+        directory = settings.OPENAPI_SCHEMA_DIR
+        if directory and os.path.exists(schema_path(directory, version, fmt)):
+            with open(schema_path(directory, version, fmt), 'rb') as source:
+                return source.read()
+        return generate_schema(version, fmt)
+
+    def clear(self):
+        with self._lock:
+            self._documents = {}
+
+
+schemas = SchemaStore()
+
+
+def write_schemas(directory):
+    os.makedirs(directory, exist_ok=True)
+    written = []
+    for version in SCHEMA_VERSIONS:
+        for fmt in FORMATS:
+            path = schema_path(directory, version, fmt)
+            with open(path, 'wb') as out:
+                out.write(generate_schema(version, fmt))
+            written.append(path)
+    schemas.clear()
+    return written
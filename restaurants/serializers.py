@@ -1,30 +1,38 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User, Group
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from .fieldsets import SparseFieldsetMixin
 from .models import Restaurant, Menu, Dish, Vote
+from .timing import TimedListSerializer, TimedSerializerMixin
 
 
-class RestaurantSerializer(serializers.ModelSerializer):
+class RestaurantSerializer(TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Restaurant
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'name', 'description']
 
 
-class DishSerializer(serializers.ModelSerializer):
+class DishSerializer(TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Dish
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'name', 'description', 'price']
+        expandable_fields = {'restaurant': (RestaurantSerializer, {})}
 
     def create(self, validated_data):
         return Dish.objects.create(**validated_data)
 
 
-class MenuSerializer(serializers.ModelSerializer):
+class MenuSerializer(TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     dishes = DishSerializer(many=True, read_only=True)
     dish_ids = serializers.PrimaryKeyRelatedField(queryset=Dish.objects.all(), many=True, write_only=True)
 
     class Meta:
         model = Menu
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'name', 'date', 'dishes', 'dish_ids']
+        expandable_fields = {'restaurant': (RestaurantSerializer, {})}
 
     def create(self, validated_data):
         dishes = validated_data.pop('dish_ids')
@@ -33,13 +41,20 @@ class MenuSerializer(serializers.ModelSerializer):
         return menu
 
 
-class UserSerializer(serializers.ModelSerializer):
+class MenuBatchEntrySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    name = serializers.CharField(max_length=50)
+    dish_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
     role = serializers.ChoiceField(choices=[('Admin', 'Admin'), ('Employee', 'Employee')], write_only=True)
     groups = serializers.SerializerMethodField()
 
     class Meta:
         model = User
+        list_serializer_class = TimedListSerializer
         fields = ['username', 'password', 'role', 'groups']
 
     def create(self, validated_data):
@@ -59,12 +74,19 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
     def get_groups(self, obj):
-        return list(obj.groups.values_list('name', flat=True))
+        return [group.name for group in obj.groups.all()]
+
+
+class EmployeeImportSerializer(serializers.Serializer):
+    username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+    password = serializers.CharField()
+    role = serializers.ChoiceField(choices=[('Admin', 'Admin'), ('Employee', 'Employee')])
 
 
-class VoteSerializer(serializers.ModelSerializer):
+class VoteSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Vote
+        list_serializer_class = TimedListSerializer
         fields = ['menu']
 
 
@@ -0,0 +1,163 @@
+from datetime import date
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.contrib.auth.models import Group, User
+from django.dispatch import receiver
+from django.utils import timezone
+
+from restaurants.authentication import invalidate_cached_users
+
+from restaurants.cache import MenuCache, ballot_resets, ballot_versions, restaurant_key_cache, results_versions
+from restaurants.live import results_broker
+from restaurants.models import Dish, Menu, RankedBallot, Restaurant, Vote, VoteTally
+from restaurants.views.v1.service import VoteTallyService
+
+
+def publish_results(vote):
+    # Cascaded deletes may run after the menu row is gone, so only trust an already loaded menu.
+    menu_field = Vote._meta.get_field('menu')
+    day = vote.menu.date if menu_field.is_cached(vote) else date.today()
+    results_versions.bump(day)
+    transaction.on_commit(lambda: results_broker().publish(day))
+
+
+@receiver(pre_save, sender=Vote)
+def remember_previous_menu(sender, instance, **kwargs):
+    instance._previous_menu_id = None
+    if instance.pk:
+        instance._previous_menu_id = Vote.objects.filter(pk=instance.pk).values_list('menu_id', flat=True).first()
+
+
+@receiver(post_save, sender=Vote)
+def update_tally_on_save(sender, instance, created, **kwargs):
+    previous_menu_id = getattr(instance, '_previous_menu_id', None)
+    if created:
+        VoteTallyService.add(instance.menu)
+        publish_results(instance)
+    elif previous_menu_id is not None and previous_menu_id != instance.menu_id:
+        VoteTallyService.remove(previous_menu_id)
+        VoteTallyService.add(instance.menu)
+        publish_results(instance)
+
+
+@receiver(post_delete, sender=Vote)
+def update_tally_on_delete(sender, instance, **kwargs):
+    VoteTallyService.remove(instance.menu_id)
+    publish_results(instance)
+
+
+@receiver(post_save, sender=RankedBallot)
+@receiver(post_delete, sender=RankedBallot)
+def publish_ballot(sender, instance, created=False, **kwargs):
+    if not created:
+        ballot_resets.bump(instance.date)
+    ballot_versions.bump(instance.date)
+
+
+@receiver(pre_save, sender=Menu)
+def remember_previous_menu_date(sender, instance, **kwargs):
+    instance._previous_date = None
+    if instance.pk:
+        instance._previous_date = Menu.objects.filter(pk=instance.pk).values_list('date', flat=True).first()
+
+
+@receiver(post_save, sender=Menu)
+@receiver(post_delete, sender=Menu)
+def invalidate_menu_cache(sender, instance, **kwargs):
+    days = [instance.date]
+    if getattr(instance, '_previous_date', None):
+        days.append(instance._previous_date)
+    MenuCache.invalidate(*days)
+
+
+@receiver(post_save, sender=Menu)
+def move_menu_votes(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_date', None)
+    if created or previous is None or previous == instance.date:
+        return
+    Vote.objects.filter(menu=instance).update(date=instance.date)
+    VoteTally.objects.filter(menu=instance).update(date=instance.date)
+    results_versions.bump(previous, instance.date)
+    for day in (previous, instance.date):
+        transaction.on_commit(lambda day=day: results_broker().publish(day))
+
+
+@receiver(pre_delete, sender=Dish)
+def remember_dish_menu_dates(sender, instance, **kwargs):
+    instance._menu_dates = list(instance.menus.values_list('date', flat=True).distinct())
+
+
+@receiver(post_save, sender=Dish)
+@receiver(post_delete, sender=Dish)
+def invalidate_dish_menus(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    days = getattr(instance, '_menu_dates', None)
+    if days is None:
+        days = instance.menus.values_list('date', flat=True).distinct()
+    MenuCache.invalidate(*days)
+
+
+@receiver(m2m_changed, sender=Menu.dishes.through)
+def invalidate_menu_dishes(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        instance._menu_dates = list(instance.menus.values_list('date', flat=True).distinct())
+        return
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        MenuCache.invalidate(instance.date)
+    elif pk_set:
+        MenuCache.invalidate(*Menu.objects.filter(pk__in=pk_set).values_list('date', flat=True).distinct())
+    else:
+        MenuCache.invalidate(*getattr(instance, '_menu_dates', []))
+
+
+@receiver(post_save, sender=Restaurant)
+@receiver(post_delete, sender=Restaurant)
+def evict_restaurant_api_keys(sender, instance, **kwargs):
+    # Evicting by pk also drops the entry of a rotated key; the new key may be cached as unknown.
+    restaurant_key_cache().evict(instance.pk, instance.api_key)
+
+
+@receiver(post_save, sender=Restaurant)
+@receiver(post_delete, sender=Restaurant)
+def invalidate_restaurant_menus(sender, instance, **kwargs):
+    # Menus expanded with ?expand=restaurant embed its fields; views pick today by local or UTC date.
+    MenuCache.invalidate(date.today(), timezone.now().date())
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    invalidate_cached_users(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_cached_group_members(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        instance._member_ids = list(instance.user_set.values_list('id', flat=True))
+        return
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        invalidate_cached_users(instance.pk)
+    else:
+        invalidate_cached_users(*(pk_set or getattr(instance, '_member_ids', [])))
+
+
+@receiver(pre_delete, sender=Group)
+def remember_group_members(sender, instance, **kwargs):
+    instance._member_ids = list(instance.user_set.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_cached_group(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    member_ids = getattr(instance, '_member_ids', None)
+    if member_ids is None:
+        member_ids = instance.user_set.values_list('id', flat=True)
+    invalidate_cached_users(*member_ids)
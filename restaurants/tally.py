@@ -0,0 +1,111 @@
+import threading
+from array import array
+
+
+class RankedTally:
+    # Ballots are kept as compact arrays of candidate indexes; candidates are sorted by menu id so
+    # that ties always go to the lower menu id, as in the current-day results.
+
+    def __init__(self, menus):
+        self.menus = sorted(menus)
+        self.index = {menu_id: position for position, (menu_id, _) in enumerate(self.menus)}
+        self.ballots = []
+        self.weights = array('I')
+        self.borda_scores = array('q', [0] * len(self.menus))
+        self.last_ballot_id = 0
+        self.seen = 0
+        self.ballots_version = None
+        self._runoff = None
+
+    def add(self, ballot_id, ranking, weight=1):
+        encoded = array('H')
+        for menu_id in ranking:
+            position = self.index.get(menu_id)
+            if position is not None and position not in encoded:
+                encoded.append(position)
+        self.last_ballot_id = max(self.last_ballot_id, ballot_id)
+        self.seen += 1
+        if not encoded:
+            return
+
+        self.ballots.append(encoded)
+        self.weights.append(weight)
+        candidates = len(self.menus)
+        for rank, position in enumerate(encoded):
+            self.borda_scores[position] += (candidates - 1 - rank) * weight
+        self._runoff = None
+
+    def _ranked(self, scores):
+        order = sorted(range(len(self.menus)), key=lambda position: (-scores[position], position))
+        return [{'menu_id': self.menus[p][0], 'menu__name': self.menus[p][1], 'score': scores[p]} for p in order]
+
+    def borda(self):
+        return self._ranked(self.borda_scores)
+
+    def instant_runoff(self):
+        if self._runoff is None:
+            self._runoff = self._instant_runoff()
+        return self._runoff
+
+    def _instant_runoff(self):
+        candidates = len(self.menus)
+        active = bytearray([1]) * candidates
+        remaining = candidates
+        rounds = []
+        while remaining:
+            counts = array('q', [0] * candidates)
+            for ballot, weight in zip(self.ballots, self.weights):
+                for position in ballot:
+                    if active[position]:
+                        counts[position] += weight
+                        break
+            total = sum(counts)
+            standings = [entry for entry in self._ranked(counts) if active[self.index[entry['menu_id']]]]
+            rounds.append([{'menu_id': entry['menu_id'], 'menu__name': entry['menu__name'],
+                            'total_votes': entry['score']} for entry in standings])
+
+            leader = standings[0]
+            if not total:
+                return {'winner': None, 'rounds': rounds}
+            if leader['score'] * 2 > total or remaining == 1:
+                return {'winner': rounds[-1][0], 'rounds': rounds}
+            # The last entry has the fewest votes and, among ties, the highest menu id.
+            active[self.index[standings[-1]['menu_id']]] = 0
+            remaining -= 1
+        return {'winner': None, 'rounds': rounds}
+
+
+class RankedTallyCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tallies = {}
+
+    def get(self, day, identity, ballots_version, source):
+        # identity changes when menus change or ballots are edited or deleted, which forces a rebuild;
+        # new ballots only bump ballots_version and are appended to the cached tally.
+        with self._lock:
+            cached = self._tallies.get(day)
+            if cached is None or cached[0] != identity:
+                cached = (identity, RankedTally(source.menus()))
+                self._tallies = {day: cached}
+            tally = cached[1]
+            if tally.ballots_version == ballots_version:
+                return tally
+
+            for ballot in source.ballots(after_id=tally.last_ballot_id):
+                tally.add(*ballot)
+            if tally.seen != source.count():
+                # A ballot committed out of id order was skipped; start over.
+                tally = RankedTally(source.menus())
+                for ballot in source.ballots(after_id=0):
+                    tally.add(*ballot)
+                self._tallies = {day: (identity, tally)}
+            tally.ballots_version = ballots_version
+            return tally
+
+    def clear(self):
+        with self._lock:
+            self._tallies = {}
+
+
+ranked_tallies = RankedTallyCache()
@@ -0,0 +1,40 @@
+from contextlib import contextmanager
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+
+from restaurants.cache import restaurant_key_cache
+from restaurants.tally import ranked_tallies
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    for alias in caches:
+        caches[alias].clear()
+    restaurant_key_cache().clear()
+    ranked_tallies.clear()
+    yield
+    for alias in caches:
+        caches[alias].clear()
+    restaurant_key_cache().clear()
+    ranked_tallies.clear()
+
+
+@pytest.fixture
+def after_query():
+    # Runs `interloper` right after the first query reading `table`, as a concurrent request would.
+    @contextmanager
+    def wrap(table, interloper):
+        fired = []
+
+        def wrapper(execute, sql, params, many, context):
+            result = execute(sql, params, many, context)
+            if not fired and sql.startswith('SELECT') and f'FROM "{table}"' in sql:
+                fired.append(True)
+                interloper()
+            return result
+
+        with connection.execute_wrapper(wrapper):
+            yield
+    return wrap
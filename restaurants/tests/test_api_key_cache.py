@@ -0,0 +1,62 @@
+import time
+import uuid
+
+import pytest
+
+from restaurants.cache import RestaurantKeyCache, get_restaurant_by_api_key
+from restaurants.models import Restaurant
+
+
+@pytest.mark.django_db
+def test_api_key_lookup_is_cached(django_assert_num_queries):
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=uuid.uuid4())
+
+    with django_assert_num_queries(1):
+        assert get_restaurant_by_api_key(str(restaurant.api_key)).pk == restaurant.pk
+        assert get_restaurant_by_api_key(str(restaurant.api_key).upper()).pk == restaurant.pk
+
+
+@pytest.mark.django_db
+def test_unknown_api_keys_are_cached_until_a_restaurant_takes_them(django_assert_num_queries):
+    api_key = uuid.uuid4()
+
+    with django_assert_num_queries(1):
+        for _ in range(2):
+            with pytest.raises(Restaurant.DoesNotExist):
+                get_restaurant_by_api_key(api_key)
+
+    with django_assert_num_queries(0):
+        with pytest.raises(Restaurant.DoesNotExist):
+            get_restaurant_by_api_key('not-a-uuid')
+
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant", api_key=api_key)
+    assert get_restaurant_by_api_key(api_key).pk == restaurant.pk
+
+
+@pytest.mark.django_db
+def test_rotated_api_key_is_evicted():
+    old_key = uuid.uuid4()
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant", api_key=old_key)
+    get_restaurant_by_api_key(old_key)
+
+    restaurant.api_key = uuid.uuid4()
+    restaurant.save()
+
+    with pytest.raises(Restaurant.DoesNotExist):
+        get_restaurant_by_api_key(old_key)
+    assert get_restaurant_by_api_key(restaurant.api_key).pk == restaurant.pk
+
+
+def test_cache_is_bounded_and_expires():
+    cache = RestaurantKeyCache(maxsize=2, ttl=0.05)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+
+    time.sleep(0.06)
+    assert cache.get('a') is None
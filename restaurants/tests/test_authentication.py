@@ -0,0 +1,61 @@
+import pytest
+from django.contrib.auth.models import Group, User
+from django.core.cache import caches
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from restaurants.authentication import user_cache_key
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create(username="user1")
+
+
+@pytest.fixture
+def api_client(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+    return client
+
+
+@pytest.mark.django_db
+def test_authenticated_user_is_cached(api_client, django_assert_num_queries):
+    url = reverse('current_results')
+
+    with django_assert_num_queries(3):
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+    with django_assert_num_queries(1):
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_read_only_endpoints_can_trust_token_claims(api_client, settings, django_assert_num_queries):
+    settings.AUTH_TRUST_TOKEN_CLAIMS = True
+
+    with django_assert_num_queries(1):
+        assert api_client.get(reverse('current_results')).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_user_and_group_changes_invalidate_the_cache(api_client, user):
+    api_client.get(reverse('current_results'))
+    assert caches['auth'].get(user_cache_key(user.pk)) is not None
+    assert caches['default'].get(user_cache_key(user.pk)) is None
+
+    user.groups.add(Group.objects.create(name="Employee"))
+    assert caches['auth'].get(user_cache_key(user.pk)) is None
+
+    api_client.get(reverse('current_results'))
+    assert [group.name for group in caches['auth'].get(user_cache_key(user.pk)).groups.all()] == ["Employee"]
+
+    Group.objects.filter(name="Employee").get().delete()
+    assert caches['auth'].get(user_cache_key(user.pk)) is None
+
+    api_client.get(reverse('current_results'))
+    user.is_active = False
+    user.save()
+
+    assert api_client.get(reverse('current_results')).status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,54 @@
+import io
+from datetime import date
+
+import pytest
+from django.core.management import call_command
+
+from restaurants.benchmarks import benchmark_scale, percentile
+from restaurants.loadgen import generate_load_data
+from restaurants.models import Menu, Vote, VoteTally
+from restaurants.views.v1.service import VoteTallyService
+
+
+@pytest.mark.django_db
+def test_generated_data_is_reproducible_and_consistent():
+    counts = generate_load_data(seed=42, restaurants=3, dishes_per_restaurant=5, menus_per_day=2, days=4,
+                                employees=20, turnout=0.5)
+    votes = list(Vote.objects.order_by('id').values_list('menu__name', 'date'))
+
+    assert counts['menus'] == Menu.objects.count() == 3 * 2 * 4
+    assert counts['votes'] == len(votes)
+    assert Menu.objects.filter(date=date.today()).exists()
+    assert not Vote.objects.filter(date__isnull=True).exists()
+    assert VoteTallyService.verify() == []
+
+    Vote.objects.all().delete()
+    VoteTally.objects.all().delete()
+    generate_load_data(seed=42, restaurants=3, dishes_per_restaurant=5, menus_per_day=2, days=4, employees=20,
+                       turnout=0.5)
+    assert list(Vote.objects.order_by('id').values_list('menu__name', 'date')) == votes
+
+
+@pytest.mark.django_db
+def test_generate_load_data_command():
+    out = io.StringIO()
+
+    call_command('generate_load_data', '--restaurants', '2', '--days', '2', '--employees', '5', stdout=out)
+
+    assert "Generated 2 restaurants" in out.getvalue()
+
+
+def test_percentile_uses_nearest_rank():
+    assert percentile([5, 1, 3, 2, 4], 50) == 3
+    assert percentile([5, 1, 3, 2, 4], 99) == 5
+
+
+@pytest.mark.django_db
+def test_benchmark_scale_reports_every_endpoint():
+    report = benchmark_scale('tiny', iterations=3, restaurants=2, dishes_per_restaurant=4, days=2, employees=5)
+
+    assert set(report['endpoints']) == {'vote_create', 'current_day_menu', 'current_day_menu_cold',
+                                        'current_results', 'restaurants_v2_list'}
+    assert all(stats['requests'] == 3 and stats['p50_ms'] <= stats['p99_ms']
+               for stats in report['endpoints'].values())
+    assert report['endpoints']['current_day_menu']['queries_max'] <= 4
@@ -0,0 +1,87 @@
+import uuid
+from datetime import date
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from restaurants.models import Restaurant, Menu, Dish, Vote
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create(username="user1")
+
+
+@pytest.fixture
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def menu(db):
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=uuid.uuid4())
+    return Menu.objects.create(name="Menu 1", date=date.today(), restaurant=restaurant)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url_name', ['current_day_menu', 'menu-v1-list', 'current_results'])
+def test_unchanged_poll_returns_not_modified_without_queries(api_client, menu, url_name,
+                                                             django_assert_num_queries):
+    url = reverse(url_name)
+    etag = api_client.get(url)['ETag']
+
+    with django_assert_num_queries(0):
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response['ETag'] == etag
+    assert not response.content
+
+
+@pytest.mark.django_db
+def test_menu_and_dish_writes_change_the_menu_etag(api_client, menu):
+    url = reverse('current_day_menu')
+    etag = api_client.get(url)['ETag']
+
+    dish = Dish.objects.create(name="Dish 1", description="Test dish", price=10.00, restaurant=menu.restaurant)
+    menu.dishes.add(dish)
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response['ETag'] != etag
+
+    etag = response['ETag']
+    dish.price = 11.00
+    dish.save()
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_votes_change_the_results_etag(api_client, user, menu):
+    url = reverse('current_results')
+    etag = api_client.get(url)['ETag']
+
+    Vote.objects.create(user=user, menu=menu)
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert list(response.data) == [{'menu__name': "Menu 1", 'total_votes': 1}]
+
+
+@pytest.mark.django_db
+def test_menu_renames_change_the_results_etag(api_client, user, menu):
+    url = reverse('current_results')
+    Vote.objects.create(user=user, menu=menu)
+    etag = api_client.get(url)['ETag']
+
+    menu.name = "Renamed Menu"
+    menu.save()
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert list(response.data) == [{'menu__name': "Renamed Menu", 'total_votes': 1}]
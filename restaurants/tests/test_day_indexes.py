@@ -0,0 +1,63 @@
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+
+from restaurants.models import Restaurant, Menu, Vote
+
+
+def explain(queryset):
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+    return queryset.explain()
+
+
+@pytest.fixture
+def menu(db):
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=uuid.uuid4())
+    return Menu.objects.create(name="Menu 1", date=date.today(), restaurant=restaurant)
+
+
+@pytest.mark.django_db
+def test_vote_copies_menu_date(menu):
+    vote = Vote.objects.create(user=User.objects.create(username="user1"), menu=menu)
+
+    assert Vote.objects.get(pk=vote.pk).date == menu.date
+
+
+@pytest.mark.django_db
+def test_moving_a_menu_moves_its_vote_dates(menu):
+    vote = Vote.objects.create(user=User.objects.create(username="user1"), menu=menu)
+
+    menu.date = date.today() + timedelta(days=1)
+    menu.save()
+
+    assert Vote.objects.get(pk=vote.pk).date == menu.date
+
+
+@pytest.mark.django_db
+def test_backfill_vote_dates_command(menu):
+    users = [User.objects.create(username=f"user{i}") for i in range(3)]
+    for user in users:
+        Vote.objects.create(user=user, menu=menu)
+    Vote.objects.update(date=None)
+
+    call_command('backfill_vote_dates', '--batch-size', '2')
+
+    assert not Vote.objects.filter(date__isnull=True).exists()
+    assert set(Vote.objects.values_list('date', flat=True)) == {menu.date}
+
+
+@pytest.mark.django_db
+def test_day_scoped_queries_use_composite_indexes(menu):
+    today = date.today()
+
+    assert 'vote_date_menu_idx' in explain(Vote.objects.filter(date=today).values('menu_id'))
+    assert 'menu_date_restaurant_idx' in explain(Menu.objects.filter(date=today))
+    # Filtering on both columns may also be served by the (restaurant, date, name) unique index.
+    assert 'INDEX' in explain(Menu.objects.filter(date=today, restaurant_id=menu.restaurant_id)).upper()
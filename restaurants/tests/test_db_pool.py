@@ -0,0 +1,130 @@
+import threading
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from restaurants.db_pool import ConnectionPool, PoolTimeout, close_pool, connection_pool
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def stats_pool():
+    yield connection_pool('stats-test', 3, 1)
+    close_pool('stats-test')
+
+
+@pytest.fixture
+def pooled_connection(db):
+    from restaurants.backends.pooled_postgresql.base import DatabaseWrapper
+
+    settings_dict = {**connection.settings_dict, 'ENGINE': 'restaurants.backends.pooled_postgresql',
+                     'CONN_MAX_AGE': 60, 'POOL': {'SIZE': 1, 'TIMEOUT': 1}}
+    wrapper = DatabaseWrapper(settings_dict, alias='pool-test')
+    yield wrapper
+    wrapper.close()
+    close_pool('pool-test')
+
+
+def test_released_connections_are_reused():
+    pool = ConnectionPool(size=2, timeout=1)
+
+    first = pool.checkout(FakeConnection)
+    pool.release(first)
+    again = pool.checkout(FakeConnection)
+
+    assert again is first
+    stats = pool.stats()
+    assert stats['checkouts'] == 2
+    assert stats['connections_created'] == 1
+    assert stats['in_use'] == 1
+
+
+def test_checkout_waits_for_a_free_slot_and_times_out():
+    pool = ConnectionPool(size=1, timeout=0.05)
+    held = pool.checkout(FakeConnection)
+
+    with pytest.raises(PoolTimeout):
+        pool.checkout(FakeConnection)
+
+    pool.timeout = 1
+    releaser = threading.Timer(0.05, pool.release, args=(held,))
+    releaser.start()
+    assert pool.checkout(FakeConnection) is held
+    releaser.join()
+
+    stats = pool.stats()
+    assert stats['timeouts'] == 1
+    assert stats['wait_ms_max'] >= 40
+
+
+def test_unhealthy_and_unreusable_connections_are_discarded():
+    pool = ConnectionPool(size=2, timeout=1, check=lambda connection: not connection.closed)
+    broken = pool.checkout(FakeConnection)
+    dirty = pool.checkout(FakeConnection)
+    pool.release(broken)
+    broken.closed = True
+    pool.release(dirty, reusable=False)
+
+    fresh = pool.checkout(FakeConnection)
+
+    assert fresh is not broken and fresh is not dirty
+    assert dirty.closed
+    assert pool.stats()['connections_discarded'] == 2
+
+
+@pytest.mark.django_db
+def test_pool_stats_endpoint(stats_pool):
+    stats_pool.release(stats_pool.checkout(FakeConnection))
+    client = APIClient()
+    client.force_authenticate(user=User.objects.create(username="admin", is_staff=True))
+
+    response = client.get(reverse('db_pool_stats'))
+
+    assert response.data['stats-test']['checkouts'] == 1
+    assert response.data['stats-test']['idle'] == 1
+
+
+def test_close_pool_discards_idle_connections():
+    pool = connection_pool('close-test', 1, 1)
+    idle = pool.checkout(FakeConnection)
+    pool.release(idle)
+
+    close_pool('close-test')
+
+    assert idle.closed
+    assert connection_pool('close-test', 1, 1) is not pool
+    close_pool('close-test')
+
+
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason="The pooled backend needs PostgreSQL.")
+@pytest.mark.django_db
+def test_pooled_backend_reuses_and_resets_connections(pooled_connection):
+    assert pooled_connection.settings_dict['CONN_MAX_AGE'] == 0
+    pooled_connection.ensure_connection()
+    raw = pooled_connection.connection
+    pooled_connection.close()
+
+    pooled_connection.ensure_connection()
+    assert pooled_connection.connection is raw
+
+    pooled_connection.set_autocommit(False)
+    with pooled_connection.cursor() as cursor:
+        cursor.execute('CREATE TEMPORARY TABLE pool_probe (id integer)')
+    pooled_connection.close()
+
+    pooled_connection.ensure_connection()
+    assert pooled_connection.connection is raw
+    with pooled_connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('pool_probe')")
+        assert cursor.fetchone() == (None,)
+    assert pooled_connection.pool.stats()['connections_created'] == 1
@@ -0,0 +1,82 @@
+import uuid
+from datetime import date
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from restaurants.models import Restaurant, Dish, Menu
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def restaurant(db):
+    return Restaurant.objects.create(name="Test Restaurant", description="A test restaurant", api_key=uuid.uuid4())
+
+
+@pytest.mark.django_db
+def test_bulk_import_json_reports_row_errors(api_client, restaurant):
+    Dish.objects.create(name="Soup", description="Existing", price=5.00, restaurant=restaurant)
+    rows = [
+        {"name": "Salad", "description": "Green", "price": "7.50"},
+        {"name": "Soup", "description": "Tomato", "price": "6.00"},
+        {"name": "Pasta", "description": "Carbonara", "price": "not a price"},
+        {"name": "Salad", "description": "Again", "price": "7.00"},
+    ]
+
+    response = api_client.post(reverse('dish-bulk'), rows, format='json', HTTP_X_API_KEY=str(restaurant.api_key))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['created'] == 1
+    assert response.data['updated'] == 0
+    assert [error['row'] for error in response.data['errors']] == [2, 3, 4]
+    assert set(Dish.objects.values_list('name', flat=True)) == {"Soup", "Salad"}
+
+
+@pytest.mark.django_db
+def test_bulk_import_reports_dishes_added_concurrently(api_client, restaurant, after_query):
+    def concurrent_import():
+        Dish.objects.create(name="Salad", description="Concurrent", price=5.00, restaurant=restaurant)
+
+    rows = [{"name": "Salad", "description": "Green", "price": "7.50"},
+            {"name": "Soup", "description": "Tomato", "price": "6.00"}]
+    with after_query('restaurants_dish', concurrent_import):
+        response = api_client.post(reverse('dish-bulk'), rows, format='json',
+                                   HTTP_X_API_KEY=str(restaurant.api_key))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['created'] == 1
+    assert [error['row'] for error in response.data['errors']] == [1]
+    assert Dish.objects.get(name="Salad").description == "Concurrent"
+
+
+@pytest.mark.django_db
+def test_bulk_import_csv_upserts_existing_dishes(api_client, restaurant, django_assert_max_num_queries):
+    dish = Dish.objects.create(name="Soup", description="Existing", price=5.00, restaurant=restaurant)
+    menu = Menu.objects.create(name="Menu 1", date=date.today(), restaurant=restaurant)
+    menu.dishes.set([dish])
+    lines = ["name,description,price", "Soup,Tomato,6.00"] + [f"Dish {i},Generated,{i}.00" for i in range(200)]
+    upload = SimpleUploadedFile("dishes.csv", "\n".join(lines).encode(), content_type="text/csv")
+
+    with django_assert_max_num_queries(10):
+        response = api_client.post(reverse('dish-bulk') + '?upsert=true', {'file': upload}, format='multipart',
+                                   HTTP_X_API_KEY=str(restaurant.api_key))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {'created': 200, 'updated': 1, 'errors': []}
+    assert Dish.objects.get(name="Soup").description == "Tomato"
+    assert Dish.objects.count() == 201
+
+
+@pytest.mark.django_db
+def test_bulk_import_requires_rows(api_client, restaurant):
+    response = api_client.post(reverse('dish-bulk'), {"name": "Soup"}, format='json',
+                               HTTP_X_API_KEY=str(restaurant.api_key))
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,34 @@
+import pytest
+from django.contrib.auth.models import Group, User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def directory(db):
+    admins = Group.objects.create(name="Admin")
+    employees = Group.objects.create(name="Employee")
+    for username, group in (("alice", admins), ("albert", employees), ("bob", employees)):
+        User.objects.create(username=username).groups.add(group)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('params, usernames', [
+    ({}, ["bob", "albert", "alice"]),
+    ({'search': 'al'}, ["albert", "alice"]),
+    ({'role': 'Employee'}, ["bob", "albert"]),
+    ({'search': 'al', 'role': 'Admin'}, ["alice"]),
+])
+def test_employee_list_search_and_role_filters(directory, params, usernames):
+    response = APIClient().get(reverse('employee-v1-list'), params)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [user['username'] for user in response.data['results']] == usernames
+
+
+@pytest.mark.django_db
+def test_employee_list_embeds_prefetched_groups(directory):
+    response = APIClient().get(reverse('employee-v1-list'), {'search': 'alice'})
+
+    assert response.data['results'] == [{'username': "alice", 'groups': ["Admin"]}]
@@ -0,0 +1,78 @@
+import io
+import json
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from restaurants.views.v1.service import EmployeeImportService
+
+
+@pytest.mark.django_db
+def test_bulk_onboarding_endpoint_reports_row_errors(settings):
+    settings.EMPLOYEE_IMPORT_WORKERS = 1
+    client = APIClient()
+    client.force_authenticate(user=User.objects.create(username="admin", is_staff=True))
+    rows = [
+        {"username": "alice", "password": "password123", "role": "Employee"},
+        {"username": "admin", "password": "password123", "role": "Employee"},
+        {"username": "bob", "password": "password123", "role": "Chef"},
+        {"username": "carol", "password": "password123", "role": "Admin"},
+        {"username": "alice", "password": "password123", "role": "Admin"},
+    ]
+
+    response = client.post(reverse('employee-v1-bulk'), rows, format='json')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['created'] == 2
+    assert [error['row'] for error in response.data['errors']] == [2, 3, 5]
+    carol = User.objects.get(username="carol")
+    assert carol.is_superuser and carol.is_staff
+    assert list(carol.groups.values_list('name', flat=True)) == ["Admin"]
+    assert list(User.objects.get(username="alice").groups.values_list('name', flat=True)) == ["Employee"]
+
+
+@pytest.mark.django_db
+def test_bulk_onboarding_requires_admin():
+    client = APIClient()
+    client.force_authenticate(user=User.objects.create(username="user1"))
+
+    assert client.post(reverse('employee-v1-bulk'), [], format='json').status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_passwords_are_hashed_in_a_process_pool():
+    rows = [{"username": f"user{i}", "password": f"secret-{i}", "role": "Employee"} for i in range(4)]
+
+    report = EmployeeImportService.import_employees(rows, workers=2)
+
+    assert report == {'created': 4, 'errors': []}
+    assert all(User.objects.get(username=f"user{i}").check_password(f"secret-{i}") for i in range(4))
+
+
+@pytest.mark.django_db
+def test_import_reports_usernames_taken_concurrently(after_query):
+    rows = [{"username": name, "password": "password123", "role": "Employee"} for name in ("erin", "frank")]
+
+    with after_query('auth_user', lambda: User.objects.create(username="frank")):
+        report = EmployeeImportService.import_employees(rows, workers=1)
+
+    assert report['created'] == 1
+    assert [error['row'] for error in report['errors']] == [2]
+    assert User.objects.filter(username="erin", groups__name="Employee").exists()
+    assert not User.objects.filter(username="frank", groups__name="Employee").exists()
+
+
+@pytest.mark.django_db
+def test_import_employees_command(tmp_path):
+    path = tmp_path / "employees.json"
+    path.write_text(json.dumps([{"username": "dave", "password": "password123", "role": "Employee"}]))
+    out = io.StringIO()
+
+    call_command('import_employees', str(path), '--workers', '1', stdout=out)
+
+    assert "Created 1 employees." in out.getvalue()
+    assert User.objects.filter(username="dave", groups__name="Employee").exists()
@@ -0,0 +1,73 @@
+import json
+import logging
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from restaurants.models import Restaurant
+from restaurants.serializers import RestaurantSerializer
+from restaurants.timing import SerializationTimer, serialization_timer
+
+
+@pytest.fixture
+def capture_performance_logs(caplog):
+    logger = logging.getLogger('restaurants.performance')
+    logger.addHandler(caplog.handler)
+    caplog.set_level(logging.INFO, logger='restaurants.performance')
+    yield caplog
+    logger.removeHandler(caplog.handler)
+
+
+@pytest.mark.django_db
+def test_server_timing_header_and_log_line(settings, capture_performance_logs):
+    settings.PERF_INSTRUMENTATION_ENABLED = True
+    settings.PERF_SLOW_QUERY_THRESHOLD_MS = 0
+    settings.PERF_SLOW_QUERY_LOG_COUNT = 1
+    client = APIClient()
+    client.force_authenticate(user=User.objects.create(username="admin", is_staff=True))
+
+    response = client.get(reverse('restaurants-v1-list'), HTTP_X_APP_VERSION='2.0')
+
+    timing = response['Server-Timing']
+    assert timing.startswith('total;dur=')
+    assert 'db;dur=' in timing and 'desc="1 queries"' in timing
+    assert 'serialize;dur=' in timing and 'render;dur=' in timing
+
+    record = json.loads(capture_performance_logs.records[-1].getMessage())
+    assert record['view'] == 'restaurants-v1-list'
+    assert record['app_version'] == '2.0'
+    assert record['db_queries'] == 1
+    assert record['serialize_ms'] >= 0
+    assert len(record['slow_queries']) == 1
+
+
+@pytest.mark.django_db
+def test_instrumentation_is_off_by_default():
+    response = APIClient().get(reverse('employee-v1-list'))
+
+    assert 'Server-Timing' not in response
+
+
+@pytest.mark.django_db
+def test_serialization_timer_counts_list_serializers_once(monkeypatch):
+    Restaurant.objects.create(name="Test Restaurant", description="A test restaurant")
+    timer = SerializationTimer()
+    measured = []
+    measure = timer.measure
+
+    def counting_measure():
+        measured.append(timer.depth)
+        return measure()
+
+    monkeypatch.setattr(timer, 'measure', counting_measure)
+    token = serialization_timer.set(timer)
+    try:
+        data = RestaurantSerializer(Restaurant.objects.all(), many=True).data
+    finally:
+        serialization_timer.reset(token)
+
+    assert len(data) == 1
+    assert measured == [0, 1]
+    assert timer.duration > 0 and timer.depth == 0
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import AsyncClient, Client
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from restaurants.live import InProcessResultsBroker, stream_results
+from restaurants.models import Restaurant, Menu, Vote
+
+
+def test_broker_wakes_waiters_published_from_other_threads():
+    broker = InProcessResultsBroker()
+    day = date.today()
+
+    async def wait_for_vote():
+        waiter = asyncio.ensure_future(broker.wait(day, 0, timeout=5))
+        await asyncio.sleep(0.01)
+        threading.Thread(target=broker.publish, args=(day,)).start()
+        return await waiter
+
+    assert asyncio.run(wait_for_vote()) == 1
+
+
+def test_broker_wait_times_out_without_votes():
+    broker = InProcessResultsBroker()
+
+    assert asyncio.run(broker.wait(date.today(), 0, timeout=0.01)) == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stream_coalesces_bursts_of_votes(settings):
+    settings.LIVE_RESULTS_INTERVAL = 0.1
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=uuid.uuid4())
+    menu = Menu.objects.create(name="Menu 1", date=date.today(), restaurant=restaurant)
+    voters = [User.objects.create(username=f"voter{i}") for i in range(3)]
+
+    async def read_events():
+        stream = stream_results(date.today())
+        first = await stream.__anext__()
+        for voter in voters:
+            await sync_to_async(Vote.objects.create)(user=voter, menu=menu)
+        second = await stream.__anext__()
+        await stream.aclose()
+        return first, second
+
+    first, second = asyncio.run(read_events())
+
+    assert first.startswith('event: results\n')
+    assert 'data: []' in first
+    assert '"total_votes": 3' in second
+
+
+@pytest.mark.django_db(transaction=True)
+def test_streams_end_after_their_lifetime_and_at_midnight(settings):
+    settings.LIVE_RESULTS_MAX_AGE = 0.2
+    settings.LIVE_RESULTS_INTERVAL = 0.01
+    settings.LIVE_RESULTS_KEEPALIVE = 0.05
+    settings.LIVE_RESULTS_RETRY = 1.5
+
+    async def read_all(day):
+        return [event async for event in stream_results(day)]
+
+    events = asyncio.run(read_all(date.today()))
+
+    assert events[0].startswith('event: results\n') and 'retry: 1500\n' in events[0]
+    assert set(events[1:]) == {': keepalive\n\n'}
+    assert asyncio.run(read_all(date.today() - timedelta(days=1))) == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stream_view_requires_a_valid_token():
+    user = User.objects.create(username="user1")
+    client = AsyncClient()
+    url = reverse('current_results_stream')
+
+    assert asyncio.run(client.get(url)).status_code == 401
+
+    response = asyncio.run(client.get(url, headers={'Authorization': f'Bearer {AccessToken.for_user(user)}'}))
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/event-stream'
+
+
+@pytest.mark.django_db
+def test_stream_view_refuses_wsgi_requests():
+    user = User.objects.create(username="user1")
+
+    response = Client().get(reverse('current_results_stream'),
+                            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+
+    assert response.status_code == 501
+    assert 'ASGI' in response.json()['error']
@@ -0,0 +1,76 @@
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from restaurants.models import Restaurant, Dish, Menu
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def restaurant(db):
+    return Restaurant.objects.create(name="Test Restaurant", description="A test restaurant", api_key=uuid.uuid4())
+
+
+@pytest.fixture
+def dishes(restaurant):
+    return [Dish.objects.create(name=f"Dish {i}", description="Test dish", price=10.00, restaurant=restaurant)
+            for i in range(3)]
+
+
+@pytest.mark.django_db
+def test_batch_publishes_a_week_of_menus(api_client, restaurant, dishes, django_assert_num_queries):
+    monday = date.today()
+    entries = [
+        {"date": (monday + timedelta(days=i)).isoformat(), "name": "Lunch", "dish_ids": [d.id for d in dishes]}
+        for i in range(5)
+    ]
+
+    with django_assert_num_queries(9):
+        response = api_client.post(reverse('menu-v1-batch'), entries, format='json',
+                                   HTTP_X_API_KEY=str(restaurant.api_key))
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(response.data) == 5
+    assert all(len(menu['dishes']) == 3 for menu in response.data)
+    assert Menu.dishes.through.objects.count() == 15
+
+
+@pytest.mark.django_db
+def test_batch_rejects_foreign_dishes_and_existing_menus(api_client, restaurant, dishes):
+    other = Restaurant.objects.create(name="Other", description="Another restaurant", api_key=uuid.uuid4())
+    foreign = Dish.objects.create(name="Foreign", description="Test dish", price=10.00, restaurant=other)
+    Menu.objects.create(name="Lunch", date=date.today(), restaurant=restaurant)
+    url = reverse('menu-v1-batch')
+
+    response = api_client.post(url, [{"date": date.today().isoformat(), "name": "Dinner",
+                                      "dish_ids": [dishes[0].id, foreign.id]}],
+                               format='json', HTTP_X_API_KEY=str(restaurant.api_key))
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = api_client.post(url, [{"date": date.today().isoformat(), "name": "Lunch",
+                                      "dish_ids": [dishes[0].id]}],
+                               format='json', HTTP_X_API_KEY=str(restaurant.api_key))
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert Menu.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_concurrent_batch_publish_is_rejected(api_client, restaurant, dishes, after_query):
+    def concurrent_publish():
+        Menu.objects.create(name="Lunch", date=date.today(), restaurant=restaurant)
+
+    with after_query('restaurants_menu', concurrent_publish):
+        response = api_client.post(reverse('menu-v1-batch'), [{"date": date.today().isoformat(), "name": "Lunch",
+                                                               "dish_ids": [dishes[0].id]}],
+                                   format='json', HTTP_X_API_KEY=str(restaurant.api_key))
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data == {"error": "These menus already exist."}
@@ -0,0 +1,72 @@
+import uuid
+from datetime import date
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from restaurants.cache import MenuCache
+from restaurants.models import Restaurant, Menu, Dish
+
+
+@pytest.fixture
+def api_client(db):
+    client = APIClient()
+    client.force_authenticate(user=User.objects.create_user(username="user1", password="password123"))
+    return client
+
+
+@pytest.fixture
+def menu(db):
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=str(uuid.uuid4()))
+    dish = Dish.objects.create(name="Dish 1", description="Test Dish 1", price=10.00, restaurant=restaurant)
+    menu = Menu.objects.create(name="Menu 1", date=date.today(), restaurant=restaurant)
+    menu.dishes.set([dish])
+    return menu
+
+
+@pytest.mark.django_db
+def test_current_day_menu_is_served_from_cache(api_client, menu, django_assert_num_queries):
+    url = reverse('current_day_menu')
+    first = api_client.get(url)
+
+    with django_assert_num_queries(0):
+        second = api_client.get(url)
+
+    assert first.status_code == second.status_code == status.HTTP_200_OK
+    assert first.data == second.data
+    assert MenuCache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+
+
+@pytest.mark.django_db
+def test_menu_cache_is_invalidated_by_writes(api_client, menu):
+    url = reverse('current_day_menu')
+    api_client.get(url)
+
+    dish = menu.dishes.get()
+    dish.price = 12.50
+    dish.save()
+    assert api_client.get(url).data[0]['dishes'][0]['price'] == '12.50'
+
+    menu.dishes.clear()
+    assert api_client.get(url).data[0]['dishes'] == []
+
+    menu.name = "Renamed"
+    menu.save()
+    assert api_client.get(url).data[0]['name'] == "Renamed"
+
+    menu.delete()
+    assert api_client.get(url).data == []
+
+
+@pytest.mark.django_db
+def test_menu_list_cache_is_keyed_by_restaurant(api_client, menu):
+    other = Restaurant.objects.create(name="Other", description="Another restaurant", api_key=str(uuid.uuid4()))
+    Menu.objects.create(name="Menu 2", date=date.today(), restaurant=other)
+
+    url = reverse('menu-v1-list')
+    assert len(api_client.get(url).data) == 2
+    assert [m['name'] for m in api_client.get(url, {'restaurant': other.id}).data] == ["Menu 2"]
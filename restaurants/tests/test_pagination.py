@@ -0,0 +1,46 @@
+import uuid
+from datetime import date
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from restaurants.models import Restaurant, Menu, Vote
+
+
+@pytest.fixture
+def api_client(db):
+    client = APIClient()
+    client.force_authenticate(user=User.objects.create(username="admin", is_staff=True))
+    return client
+
+
+@pytest.mark.django_db
+def test_vote_list_walks_pages_with_cursor(api_client, django_assert_num_queries):
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=uuid.uuid4())
+    menu = Menu.objects.create(name="Menu 1", date=date.today(), restaurant=restaurant)
+    for i in range(5):
+        Vote.objects.create(user=User.objects.create(username=f"voter{i}"), menu=menu)
+
+    url = reverse('vote-list') + '?limit=2'
+    pages = []
+    while url:
+        with django_assert_num_queries(1):
+            response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append(len(response.data['results']))
+        url = response.data['next']
+
+    assert pages == [2, 2, 1]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url_name', ['dish-list', 'employee-v1-list', 'restaurants-v1-list'])
+def test_list_endpoints_are_cursor_paginated(api_client, url_name):
+    response = api_client.get(reverse(url_name))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.data) == {'next', 'previous', 'results'}
@@ -0,0 +1,63 @@
+import uuid
+from datetime import date
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from restaurants.models import Restaurant, Menu, Dish, Vote
+
+
+def make_menus(count):
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=str(uuid.uuid4()))
+    voters = [User.objects.create(username=f"voter{i}") for i in range(count)]
+    for i in range(count):
+        dishes = [
+            Dish.objects.create(name=f"Dish {i}-{j}", description="Test dish", price=10.00, restaurant=restaurant)
+            for j in range(3)
+        ]
+        menu = Menu.objects.create(name=f"Menu {i}", date=date.today(), restaurant=restaurant)
+        menu.dishes.set(dishes)
+        Vote.objects.create(user=voters[i], menu=menu)
+
+
+@pytest.fixture
+def api_client(db):
+    client = APIClient()
+    client.force_authenticate(user=User.objects.create_user(username="admin", password="password123", is_staff=True))
+    return client
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('rows', [1, 10])
+@pytest.mark.parametrize('url_name, queries', [
+    ('menu-v1-list', 2),
+    ('current_day_menu', 2),
+    ('current_results', 1),
+    ('vote-list', 1),
+    ('dish-list', 1),
+    ('restaurants-v1-list', 1),
+    ('menu-v2-list', 1),
+    ('employee-v1-list', 2),
+])
+def test_list_query_count_does_not_grow_with_rows(api_client, django_assert_num_queries, rows, url_name, queries):
+    make_menus(rows)
+
+    with django_assert_num_queries(queries):
+        response = api_client.get(reverse(url_name))
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_menu_detail_query_count(api_client, django_assert_num_queries):
+    make_menus(1)
+    menu = Menu.objects.get()
+
+    with django_assert_num_queries(2):
+        response = api_client.get(reverse('menu-v1-detail', args=[menu.id]))
+
+    assert len(response.data['dishes']) == 3
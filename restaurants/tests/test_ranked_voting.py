@@ -0,0 +1,124 @@
+import uuid
+from datetime import date
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from restaurants.models import Restaurant, Menu, RankedBallot
+from restaurants.tally import RankedTally
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def menus(db):
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=str(uuid.uuid4()))
+    return [Menu.objects.create(name=f"Menu {i}", date=date.today(), restaurant=restaurant) for i in range(1, 4)]
+
+
+def ballot(menus, *ranking, weight=1):
+    user = User.objects.create(username=f"voter-{uuid.uuid4().hex[:8]}")
+    return RankedBallot.objects.create(user=user, date=date.today(), ranking=[menus[i].id for i in ranking],
+                                       weight=weight)
+
+
+def test_instant_runoff_transfers_eliminated_votes():
+    tally = RankedTally([(1, 'A'), (2, 'B'), (3, 'C')])
+    for ballot_id, ranking in enumerate([[1], [1], [2], [2], [3, 2]], start=1):
+        tally.add(ballot_id, ranking)
+
+    result = tally.instant_runoff()
+
+    assert result['winner'] == {'menu_id': 2, 'menu__name': 'B', 'total_votes': 3}
+    assert [entry['total_votes'] for entry in result['rounds'][0]] == [2, 2, 1]
+
+
+def test_ties_go_to_the_lower_menu_id():
+    tally = RankedTally([(2, 'B'), (1, 'A')])
+    tally.add(1, [2, 1])
+    tally.add(2, [1, 2])
+
+    assert tally.instant_runoff()['winner']['menu_id'] == 1
+    assert [entry['menu_id'] for entry in tally.borda()] == [1, 2]
+
+
+def test_weights_and_unknown_menus():
+    tally = RankedTally([(1, 'A'), (2, 'B'), (3, 'C')])
+    tally.add(1, [1, 2, 3])
+    tally.add(2, [3, 99, 2], weight=2)
+    tally.add(3, [99])
+
+    assert [(entry['menu_id'], entry['score']) for entry in tally.borda()] == [(3, 4), (2, 3), (1, 2)]
+    assert tally.instant_runoff()['winner']['menu_id'] == 3
+    assert tally.seen == 3
+
+
+@pytest.mark.django_db
+def test_submit_ballot(api_client, menus):
+    user = User.objects.create(username="user1")
+    api_client.force_authenticate(user=user)
+    url = reverse('ranked_ballot')
+
+    response = api_client.post(url, {"ranking": [menus[1].id, menus[0].id]}, format='json')
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = api_client.post(url, {"ranking": [menus[0].id]}, format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    other = APIClient()
+    other.force_authenticate(user=User.objects.create(username="user2"))
+    assert other.post(url, {"ranking": [menus[0].id, menus[0].id]}, format='json').status_code == 400
+    assert other.post(url, {"ranking": []}, format='json').status_code == 400
+    assert other.post(url, {"ranking": [menus[2].id + 100]}, format='json').status_code == 404
+
+
+@pytest.mark.django_db
+def test_ranked_results_are_extended_incrementally(api_client, menus, django_assert_max_num_queries):
+    api_client.force_authenticate(user=User.objects.create(username="viewer"))
+    url = reverse('current_ranked_results')
+    ballot(menus, 0)
+    ballot(menus, 0)
+    ballot(menus, 1)
+    ballot(menus, 2, 1)
+
+    response = api_client.get(url)
+    assert response.data['winner']['menu_id'] == menus[0].id
+
+    with django_assert_max_num_queries(0):
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+
+    ballot(menus, 1)
+    with django_assert_max_num_queries(2):
+        response = api_client.get(url)
+    assert response.data['winner']['menu_id'] == menus[1].id
+
+    response = api_client.get(url, {'method': 'borda'})
+    assert [entry['menu__name'] for entry in response.data['results']] == ["Menu 2", "Menu 1", "Menu 3"]
+    assert api_client.get(url, {'method': 'plurality'}).status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_ranked_results_rebuild_after_ballot_changes(api_client, menus):
+    api_client.force_authenticate(user=User.objects.create(username="viewer"))
+    url = reverse('current_ranked_results')
+    first = ballot(menus, 0)
+    ballot(menus, 1)
+
+    assert api_client.get(url).data['winner']['menu_id'] == menus[0].id
+
+    first.weight = 1
+    first.ranking = [menus[1].id]
+    first.save()
+    assert api_client.get(url).data['winner']['total_votes'] == 2
+
+    response = api_client.get(url)
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == status.HTTP_304_NOT_MODIFIED
+    first.delete()
+    assert api_client.get(url).data['winner']['total_votes'] == 1
@@ -0,0 +1,117 @@
+import uuid
+from datetime import date
+
+import pytest
+from django.conf import settings as django_settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from restaurants.middleware import ReplicaRoutingMiddleware
+from restaurants.models import Restaurant, Menu, Vote
+from restaurants.routers import STICKY_COOKIE, ReplicaRouter, replica_reads
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ['replica_1', 'replica_2']
+    return settings
+
+
+@pytest.fixture
+def replica_context():
+    token = replica_reads.set(True)
+    yield
+    replica_reads.reset(token)
+
+
+def test_round_robin_selection(replicas, replica_context):
+    db_router = ReplicaRouter()
+
+    assert [db_router.db_for_read(Vote) for _ in range(4)] == ['replica_1', 'replica_2', 'replica_1', 'replica_2']
+    assert db_router.db_for_write(Vote) == 'default'
+    assert db_router.allow_migrate('replica_1', 'restaurants') is False
+
+
+def test_least_recent_selection(replicas, replica_context):
+    replicas.DATABASE_REPLICA_SELECTION = 'least_recent'
+    db_router = ReplicaRouter()
+
+    assert db_router.db_for_read(Vote) == 'replica_1'
+    replicas.DATABASE_REPLICAS = ['replica_1', 'replica_2', 'replica_3']
+    assert db_router.db_for_read(Vote) == 'replica_2'
+    assert db_router.db_for_read(Vote) == 'replica_3'
+    assert db_router.db_for_read(Vote) == 'replica_1'
+
+
+def test_reads_stay_on_primary_outside_safe_requests(replicas):
+    assert ReplicaRouter().db_for_read(Vote) == 'default'
+
+
+def test_writes_pin_the_client_to_the_primary(replicas):
+    seen = []
+
+    def view(request):
+        seen.append(router.db_for_read(Vote))
+        return HttpResponse()
+
+    middleware = ReplicaRoutingMiddleware(view)
+    factory = RequestFactory()
+    alice = {'HTTP_AUTHORIZATION': 'Bearer alice'}
+
+    middleware(factory.get('/results/current/', **alice))
+    middleware(factory.post('/api/v1/votes/', **alice))
+    middleware(factory.get('/results/current/', **alice))
+    middleware(factory.get('/results/current/', HTTP_AUTHORIZATION='Bearer bob'))
+
+    assert seen[0].startswith('replica_')
+    assert seen[1:3] == ['default', 'default']
+    assert seen[3].startswith('replica_')
+
+
+def test_the_pin_cookie_works_across_workers(replicas):
+    seen = []
+
+    def view(request):
+        seen.append(router.db_for_read(Vote))
+        return HttpResponse()
+
+    factory = RequestFactory()
+    response = ReplicaRoutingMiddleware(view)(factory.post('/api/v1/votes/'))
+    cookie = response.cookies[STICKY_COOKIE].value
+    caches['default'].clear()
+
+    other_worker = ReplicaRoutingMiddleware(view)
+    request = factory.get('/results/current/')
+    request.COOKIES[STICKY_COOKIE] = cookie
+    other_worker(request)
+    forged = factory.get('/results/current/')
+    forged.COOKIES[STICKY_COOKIE] = '1'
+    other_worker(forged)
+
+    assert seen[1] == 'default'
+    assert seen[2].startswith('replica_')
+
+
+@pytest.mark.skipif(not django_settings.DATABASE_REPLICAS, reason="Set DB_REPLICAS to run against replica aliases.")
+@pytest.mark.django_db(transaction=True, databases='__all__')
+def test_current_results_read_from_a_replica():
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=str(uuid.uuid4()))
+    menu = Menu.objects.create(name="Menu 1", date=date.today(), restaurant=restaurant)
+    user = User.objects.create(username="user1")
+    Vote.objects.create(user=user, menu=menu)
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    replica = connections[django_settings.DATABASE_REPLICAS[0]]
+    with CaptureQueriesContext(replica) as queries:
+        response = client.get(reverse('current_results'))
+
+    assert response.data == [{'menu__name': "Menu 1", 'total_votes': 1}]
+    assert len(queries) > 0
@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from restaurants.models import Restaurant, Menu
+
+
+@pytest.fixture
+def api_client(db):
+    client = APIClient()
+    client.force_authenticate(user=User.objects.create(username="admin", is_staff=True))
+    return client
+
+
+@pytest.fixture
+def restaurants(db):
+    today = date.today()
+    restaurants = [Restaurant.objects.create(name=f"Restaurant {i}", description="A test restaurant") for i in range(3)]
+    Menu.objects.create(name="Today", date=today, restaurant=restaurants[0])
+    Menu.objects.create(name="Long ago", date=today - timedelta(days=60), restaurant=restaurants[0])
+    Menu.objects.create(name="Today", date=today, restaurant=restaurants[1])
+    return restaurants
+
+
+@pytest.mark.django_db
+def test_list_annotates_menu_count(api_client, restaurants):
+    response = api_client.get(reverse('menu-v2-list'), HTTP_X_APP_VERSION='2.0')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [r['menu_count'] for r in response.data] == [2, 1, 0]
+    assert response.data[0]['additional_info'] == "New feature for version 2.0"
+
+
+@pytest.mark.django_db
+def test_list_filters_menu_count_by_window(api_client, restaurants):
+    url = reverse('menu-v2-list')
+    Menu.objects.create(name="Published ahead", date=date.today() + timedelta(days=40), restaurant=restaurants[1])
+
+    for window in ('today', 'week', 'month'):
+        response = api_client.get(url, {'menus_window': window})
+        assert [r['menu_count'] for r in response.data] == [1, 1, 0]
+
+    response = api_client.get(url, {'menus_from': date.today().isoformat()})
+    assert [r['menu_count'] for r in response.data] == [1, 2, 0]
+
+    response = api_client.get(url, {'menus_to': (date.today() - timedelta(days=1)).isoformat()})
+    assert [r['menu_count'] for r in response.data] == [1, 0, 0]
+
+    response = api_client.get(url, {'menus_window': 'year'})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_list_paginates_with_page_and_limit(api_client, restaurants, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        response = api_client.get(reverse('menu-v2-list'), {'page': 2, 'limit': 2})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['count'] == 3
+    assert [r['name'] for r in response.data['results']] == ["Restaurant 2"]
+    assert response.data['previous'] is not None
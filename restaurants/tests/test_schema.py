@@ -0,0 +1,68 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from restaurants.schema import schemas
+
+
+@pytest.fixture(autouse=True)
+def fresh_schemas():
+    schemas.clear()
+    yield
+    schemas.clear()
+
+
+def test_boot_does_not_import_drf_yasg():
+    code = ("import sys, django; django.setup(); import lunch_decider.urls; "
+            "print(any(name.startswith('drf_yasg') for name in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'lunch_decider.settings'}).stdout
+
+    assert output.strip() == 'False'
+
+
+@pytest.mark.django_db
+def test_schema_is_generated_once_and_served_with_cache_headers(settings):
+    settings.OPENAPI_SCHEMA_MAX_AGE = 600
+    client = APIClient()
+
+    response = client.get(reverse('schema-json', kwargs={'format': '.json'}))
+
+    assert response.status_code == 200
+    assert response['Cache-Control'] == 'public, max-age=600'
+    assert json.loads(response.content)['info']['version'] == 'v1'
+    assert schemas.get('v1', 'json').content == response.content
+
+    response = client.get(reverse('schema-json', kwargs={'format': '.json'}), HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == 304
+
+    response = client.get(reverse('schema-swagger-ui-v2'), {'format': 'openapi'})
+    assert json.loads(response.content)['info']['version'] == 'v2'
+    assert client.get(reverse('schema-json', kwargs={'format': '.xml'})).status_code == 404
+
+
+@pytest.mark.django_db
+def test_ui_pages_render():
+    client = APIClient()
+
+    assert client.get(reverse('schema-swagger-ui')).status_code == 200
+    assert b'redoc' in client.get(reverse('schema-redoc')).content.lower()
+
+
+@pytest.mark.django_db
+def test_command_writes_schemas_that_are_served_from_disk(settings, tmp_path):
+    call_command('generate_openapi_schemas', output_dir=str(tmp_path))
+
+    assert sorted(os.listdir(tmp_path)) == ['v1.json', 'v1.yaml', 'v2.json', 'v2.yaml']
+
+    (tmp_path / 'v1.json').write_bytes(b'{"swagger": "2.0", "from": "disk"}')
+    settings.OPENAPI_SCHEMA_DIR = str(tmp_path)
+    response = APIClient().get(reverse('schema-json', kwargs={'format': '.json'}))
+
+    assert json.loads(response.content)['from'] == 'disk'
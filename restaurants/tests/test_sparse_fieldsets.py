@@ -0,0 +1,98 @@
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from restaurants.models import Restaurant, Menu, Dish
+from restaurants.renderers import CompactJSONRenderer
+
+
+@pytest.fixture
+def api_client(db):
+    client = APIClient()
+    client.force_authenticate(user=User.objects.create(username="admin", is_staff=True))
+    return client
+
+
+@pytest.fixture
+def menu(db):
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=str(uuid.uuid4()))
+    dish = Dish.objects.create(name="Dish 1", description="A long description", price=10.00, restaurant=restaurant)
+    menu = Menu.objects.create(name="Menu 1", date=date.today(), restaurant=restaurant)
+    menu.dishes.set([dish])
+    return menu
+
+
+@pytest.mark.django_db
+def test_menu_fields_limit_output_and_columns(api_client, menu):
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(reverse('menu-v1-list'), {'fields': 'id,name,dishes.name,dishes.price'})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert list(response.data) == [{'id': menu.id, 'name': "Menu 1", 'dishes': [{'name': "Dish 1", 'price': '10.00'}]}]
+    dish_query = queries.captured_queries[-1]['sql']
+    assert '"description"' not in dish_query and '"price"' in dish_query
+
+
+@pytest.mark.django_db
+def test_menu_cache_is_keyed_by_fieldset(api_client, menu):
+    url = reverse('current_day_menu')
+
+    full = api_client.get(url).data
+    sparse = api_client.get(url, {'fields': 'name'}).data
+    expanded = api_client.get(url, {'fields': 'name,restaurant.name', 'expand': 'restaurant'}).data
+
+    assert 'description' in full[0]['dishes'][0]
+    assert sparse == [{'name': "Menu 1"}]
+    assert expanded == [{'name': "Menu 1", 'restaurant': {'name': "Test Restaurant"}}]
+
+
+@pytest.mark.django_db
+def test_expanded_restaurant_follows_a_rename(api_client, menu):
+    url = reverse('current_day_menu')
+    params = {'fields': 'name,restaurant.name', 'expand': 'restaurant'}
+    etag = api_client.get(url, params)['ETag']
+
+    menu.restaurant.name = "Renamed Restaurant"
+    menu.restaurant.save()
+
+    assert api_client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+    assert api_client.get(url, params).data == [{'name': "Menu 1", 'restaurant': {'name': "Renamed Restaurant"}}]
+
+
+@pytest.mark.django_db
+def test_invalid_fieldsets_are_rejected(api_client, menu):
+    assert api_client.get(reverse('current_day_menu'), {'fields': 'secret'}).status_code == 400
+    assert api_client.get(reverse('menu-v1-list'), {'expand': 'votes'}).status_code == 400
+    assert api_client.get(reverse('dish-list'), {'fields': 'name.first'}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_restaurant_and_dish_fieldsets(api_client, menu):
+    response = api_client.get(reverse('menu-v2-list'), {'fields': 'name'})
+    assert response.data[0] == {'name': "Test Restaurant", 'menu_count': 1,
+                                'additional_info': "You have version 1.0"}
+
+    response = api_client.get(reverse('dish-detail', args=[menu.dishes.get().id]),
+                              {'fields': 'name,restaurant', 'expand': 'restaurant'})
+    assert response.data == {'name': "Dish 1", 'restaurant': {'id': menu.restaurant_id, 'name': "Test Restaurant",
+                                                              'description': "A test restaurant"}}
+
+    response = api_client.post(reverse('restaurants-v1-list') + '?fields=id',
+                               {'name': "New", 'description': "Created"})
+    assert response.data['name'] == "New"
+
+
+def test_compact_renderer_matches_the_default_renderer():
+    data = {'name': "Menu\u20281", 'price': Decimal('10.50'), 'date': date(2024, 1, 2), 'dishes': [1, 2]}
+
+    assert CompactJSONRenderer().render(data) == JSONRenderer().render(data)
@@ -0,0 +1,91 @@
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command, CommandError
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from restaurants.models import Restaurant, Menu, Vote, DailyVoteRollup, RolledUpDay
+from restaurants.views.v1.service import VoteRollupService
+
+
+@pytest.fixture
+def history(db):
+    voters = [User.objects.create(username=f"voter{i}") for i in range(3)]
+    first = Restaurant.objects.create(name="First", description="A test restaurant", api_key=uuid.uuid4())
+    second = Restaurant.objects.create(name="Second", description="A test restaurant", api_key=uuid.uuid4())
+    monday = date.today() - timedelta(days=date.today().weekday() + 7)
+    for offset, winner_votes in ((0, 2), (1, 1), (2, 0)):
+        day = monday + timedelta(days=offset)
+        menu_first = Menu.objects.create(name="Lunch", date=day, restaurant=first)
+        menu_second = Menu.objects.create(name="Lunch", date=day, restaurant=second)
+        for voter in voters[:winner_votes]:
+            Vote.objects.create(user=voter, menu=menu_first)
+        Vote.objects.create(user=voters[2], menu=menu_second)
+    Menu.objects.create(name="Lunch", date=date.today(), restaurant=first)
+    return first, second, monday
+
+
+@pytest.mark.django_db
+def test_rollup_only_processes_new_closed_days(history, django_assert_max_num_queries):
+    call_command('rollup_votes')
+
+    assert RolledUpDay.objects.count() == 3
+    assert DailyVoteRollup.objects.filter(restaurant=history[0]).count() == 2
+
+    with django_assert_max_num_queries(1):
+        call_command('rollup_votes')
+
+
+@pytest.mark.django_db
+def test_rollup_refuses_votes_without_dates(history):
+    Vote.objects.filter(menu__restaurant=history[1]).update(date=None)
+
+    with pytest.raises(CommandError, match='backfill_vote_dates'):
+        call_command('rollup_votes')
+    assert not RolledUpDay.objects.exists()
+
+    call_command('backfill_vote_dates')
+    call_command('rollup_votes')
+
+    assert DailyVoteRollup.objects.filter(restaurant=history[1]).count() == 3
+
+
+@pytest.mark.django_db
+def test_rebuild_keeps_rollups_of_archived_months(history):
+    days = [history[2] + timedelta(days=offset) for offset in range(3)]
+    call_command('rollup_votes')
+    # As if the partitions holding these votes were archived.
+    Vote.objects.filter(date__in=days).delete()
+
+    VoteRollupService.rollup(rebuild=True, keep_months={day.replace(day=1) for day in days})
+    assert DailyVoteRollup.objects.count() == 5
+
+    VoteRollupService.rollup(rebuild=True)
+    assert not DailyVoteRollup.objects.exists()
+
+
+@pytest.mark.django_db
+def test_analytics_aggregates_by_week(history):
+    first, second, monday = history
+    call_command('rollup_votes')
+    client = APIClient()
+    client.force_authenticate(user=User.objects.create(username="admin", is_staff=True))
+
+    response = client.get(reverse('vote_analytics'), {'granularity': 'week'})
+
+    assert response.status_code == status.HTTP_200_OK
+    # The 1-1 tie on Tuesday goes to the lower restaurant id, like ties in the current-day results.
+    assert response.data == [
+        {'period': monday, 'restaurant_id': first.id, 'restaurant_name': "First", 'votes': 3, 'share': 0.5,
+         'days_won': 2},
+        {'period': monday, 'restaurant_id': second.id, 'restaurant_name': "Second", 'votes': 3, 'share': 0.5,
+         'days_won': 1},
+    ]
+
+    response = client.get(reverse('vote_analytics'), {'restaurant': first.id, 'date_from': monday.isoformat(),
+                                                      'date_to': monday.isoformat()})
+    assert [(row['votes'], row['days_won']) for row in response.data] == [(2, 1)]
@@ -0,0 +1,94 @@
+import threading
+import uuid
+from datetime import date
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from rest_framework import serializers
+
+from restaurants.models import Restaurant, Menu, Vote, VoteTally
+from restaurants.views.v1.service import VoteService, VoteTallyService
+
+
+@pytest.mark.django_db
+def test_duplicate_vote_is_rejected_by_unique_constraint():
+    user = User.objects.create(username="user1")
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=str(uuid.uuid4()))
+    menu = Menu.objects.create(name="Menu 1", date=date.today(), restaurant=restaurant)
+    VoteService.create_vote(menu.id, user)
+
+    with pytest.raises(serializers.ValidationError):
+        VoteService.create_vote(menu.id, user)
+
+    assert Vote.objects.count() == 1
+    assert VoteTally.objects.get(menu=menu).count == 1
+
+
+@pytest.mark.skipif(connection.vendor == 'sqlite', reason="SQLite serializes writers with table locks")
+@pytest.mark.django_db(transaction=True)
+def test_parallel_duplicate_votes_create_exactly_one_vote():
+    user = User.objects.create(username="user1")
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=str(uuid.uuid4()))
+    menu = Menu.objects.create(name="Menu 1", date=date.today(), restaurant=restaurant)
+
+    workers = 8
+    barrier = threading.Barrier(workers)
+    outcomes = []
+
+    def vote():
+        try:
+            barrier.wait()
+            VoteService.create_vote(menu.id, user)
+            outcomes.append('created')
+        except serializers.ValidationError:
+            outcomes.append('duplicate')
+        except Exception as exc:
+            outcomes.append(exc)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=vote) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(outcomes, key=str) == ['created'] + ['duplicate'] * (workers - 1)
+    assert Vote.objects.count() == 1
+    assert VoteTally.objects.get(menu=menu).count == 1
+
+
+@pytest.mark.skipif(connection.vendor == 'sqlite', reason="SQLite serializes writers with table locks")
+@pytest.mark.django_db(transaction=True)
+def test_rebuild_during_voting_keeps_every_vote():
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=str(uuid.uuid4()))
+    menu = Menu.objects.create(name="Menu 1", date=date.today(), restaurant=restaurant)
+    users = [User.objects.create(username=f"user{i}") for i in range(20)]
+    errors = []
+
+    def run(target):
+        try:
+            target()
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            connections.close_all()
+
+    def rebuild():
+        for _ in range(10):
+            VoteTallyService.rebuild(date.today())
+
+    threads = [threading.Thread(target=run, args=(rebuild,))]
+    threads += [threading.Thread(target=run, args=(lambda user=user: VoteService.create_vote(menu.id, user),))
+                for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert VoteTally.objects.get(menu=menu).count == len(users)
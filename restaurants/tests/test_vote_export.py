@@ -0,0 +1,81 @@
+import asyncio
+import csv
+import io
+import json
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from restaurants.models import Restaurant, Menu, Vote
+from restaurants.views.v1.service import VoteExportService
+
+
+@pytest.fixture
+def votes(db):
+    user = User.objects.create(username="user1")
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=uuid.uuid4())
+    other = Restaurant.objects.create(name="Other", description="Another restaurant", api_key=uuid.uuid4())
+    today = Menu.objects.create(name="Today", date=date.today(), restaurant=restaurant)
+    yesterday = Menu.objects.create(name="Yesterday", date=date.today() - timedelta(days=1), restaurant=restaurant)
+    elsewhere = Menu.objects.create(name="Elsewhere", date=date.today(), restaurant=other)
+    return [Vote.objects.create(user=user, menu=menu) for menu in (today, yesterday, elsewhere)]
+
+
+@pytest.mark.django_db
+def test_export_streams_csv_with_filters(votes):
+    client = APIClient()
+    client.force_authenticate(user=User.objects.create(username="admin", is_staff=True))
+    restaurant_id = votes[0].menu.restaurant_id
+
+    response = client.get(reverse('vote-export'), {'date_from': date.today().isoformat(), 'restaurant': restaurant_id})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+    assert [row['menu_name'] for row in rows] == ["Today"]
+    assert rows[0]['username'] == "user1"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_export_streams_asynchronously_under_asgi(votes, monkeypatch):
+    monkeypatch.setattr(VoteExportService, 'CHUNK_SIZE', 2)
+    admin = User.objects.create(username="admin", is_staff=True)
+
+    async def export():
+        response = await AsyncClient().get(reverse('vote-export'), {'output': 'ndjson'},
+                                           headers={'Authorization': f'Bearer {AccessToken.for_user(admin)}'})
+        return response, [chunk async for chunk in response.streaming_content]
+
+    response, chunks = asyncio.run(export())
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.is_async
+    assert [json.loads(chunk)['vote_id'] for chunk in chunks] == [vote.id for vote in votes]
+
+
+@pytest.mark.django_db
+def test_export_requires_admin(votes):
+    client = APIClient()
+    client.force_authenticate(user=votes[0].user)
+
+    assert client.get(reverse('vote-export')).status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_export_votes_command_writes_ndjson(votes):
+    out = io.StringIO()
+
+    call_command('export_votes', '--output', 'ndjson', stdout=out)
+
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [line['vote_id'] for line in lines] == [vote.id for vote in votes]
+    assert lines[1]['menu_date'] == (date.today() - timedelta(days=1)).isoformat()
@@ -0,0 +1,114 @@
+import uuid
+from datetime import date
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command, CommandError
+from django.db import IntegrityError, connection
+
+from restaurants.models import Restaurant, Menu, Vote, DailyVoteRollup
+from restaurants.partitioning import (VotePartitioner, add_months, archive_name, months_between, month_start,
+                                      months_to_archive, months_to_create, partition_month, partition_name)
+
+postgres_only = pytest.mark.skipif(connection.vendor != 'postgresql', reason="Partitioning requires PostgreSQL.")
+
+
+@pytest.fixture
+def scratch_vote_table(transactional_db):
+    # Converting rewrites the table, so work on a copy in a throwaway schema; --reuse-db keeps the plain one.
+    table = connection.ops.quote_name(Vote._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute('DROP SCHEMA IF EXISTS vote_partitioning_test CASCADE')
+        cursor.execute('CREATE SCHEMA vote_partitioning_test')
+        cursor.execute(f'CREATE TABLE vote_partitioning_test.{table} (LIKE public.{table} INCLUDING ALL)')
+        cursor.execute('SET search_path TO vote_partitioning_test, public')
+    yield
+    with connection.cursor() as cursor:
+        cursor.execute('RESET search_path')
+        cursor.execute('DROP SCHEMA vote_partitioning_test CASCADE')
+
+
+def test_month_arithmetic():
+    assert add_months(date(2024, 11, 15), 3) == date(2025, 2, 1)
+    assert add_months(date(2024, 1, 31), -1) == date(2023, 12, 1)
+    assert list(months_between(date(2024, 11, 20), date(2025, 1, 5))) == [
+        date(2024, 11, 1), date(2024, 12, 1), date(2025, 1, 1)]
+
+
+def test_partition_names_round_trip():
+    name = partition_name('restaurants_vote', date(2024, 3, 1))
+
+    assert name == 'restaurants_vote_p2024_03'
+    assert partition_month(name) == date(2024, 3, 1)
+    assert partition_month('restaurants_vote_default') is None
+
+
+def test_months_to_create_and_archive():
+    today = date(2024, 5, 17)
+    months = [date(2023, 12, 1), date(2024, 1, 1), date(2024, 2, 1), date(2024, 5, 1)]
+
+    assert months_to_create(today, 2) == [date(2024, 5, 1), date(2024, 6, 1), date(2024, 7, 1)]
+    assert months_to_archive(months, today, 3) == [date(2023, 12, 1), date(2024, 1, 1)]
+
+
+@pytest.mark.skipif(connection.vendor == 'postgresql', reason="Checks the error on other databases.")
+@pytest.mark.django_db
+def test_command_requires_postgres():
+    with pytest.raises(CommandError):
+        call_command('partition_votes')
+
+
+@postgres_only
+@pytest.mark.django_db(transaction=True)
+def test_convert_keeps_votes_and_uniqueness(scratch_vote_table):
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=str(uuid.uuid4()))
+    old_menu = Menu.objects.create(name="Old", date=add_months(date.today(), -14), restaurant=restaurant)
+    menu = Menu.objects.create(name="Today", date=date.today(), restaurant=restaurant)
+    user = User.objects.create(username="user1")
+    Vote.objects.create(user=user, menu=old_menu)
+    Vote.objects.create(user=user, menu=menu)
+
+    call_command('partition_votes', '--convert', '--retain', '12', '--force')
+
+    partitioner = VotePartitioner()
+    assert partitioner.is_partitioned()
+    assert add_months(date.today(), 1) in partitioner.partitions()
+    assert list(Vote.objects.values_list('menu__name', flat=True)) == ["Today"]
+    with pytest.raises(IntegrityError):
+        Vote.objects.create(user=user, menu=menu)
+
+
+@postgres_only
+@pytest.mark.django_db(transaction=True)
+def test_archived_votes_do_not_block_deleting_users(scratch_vote_table):
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=str(uuid.uuid4()))
+    month = add_months(date.today(), -14)
+    old_menu = Menu.objects.create(name="Old", date=month, restaurant=restaurant)
+    user = User.objects.create(username="user1")
+    Vote.objects.create(user=user, menu=old_menu)
+
+    call_command('partition_votes', '--convert', '--retain', '12', '--force')
+    user.delete()
+    old_menu.delete()
+
+    archive = connection.ops.quote_name(archive_name(Vote._meta.db_table, month_start(month)))
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT COUNT(*) FROM {archive}')
+        assert cursor.fetchone() == (1,)
+
+
+@postgres_only
+@pytest.mark.django_db(transaction=True)
+def test_rollup_rebuild_keeps_archived_months(scratch_vote_table):
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=str(uuid.uuid4()))
+    old_menu = Menu.objects.create(name="Old", date=add_months(date.today(), -14), restaurant=restaurant)
+    Vote.objects.create(user=User.objects.create(username="user1"), menu=old_menu)
+    call_command('rollup_votes')
+    call_command('partition_votes', '--convert', '--retain', '12')
+
+    call_command('rollup_votes', '--rebuild')
+
+    assert DailyVoteRollup.objects.get(menu=old_menu).votes == 1
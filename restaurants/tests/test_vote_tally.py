@@ -0,0 +1,116 @@
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command, CommandError
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from restaurants.models import Restaurant, Menu, Vote, VoteTally
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def menus(db):
+    restaurant = Restaurant.objects.create(name="Test Restaurant", description="A test restaurant",
+                                           api_key=str(uuid.uuid4()))
+    menu1 = Menu.objects.create(name="Menu 1", date=date.today(), restaurant=restaurant)
+    menu2 = Menu.objects.create(name="Menu 2", date=date.today(), restaurant=restaurant)
+    return menu1, menu2
+
+
+@pytest.mark.django_db
+def test_vote_endpoint_updates_tally(api_client, menus):
+    menu1, _ = menus
+    user = User.objects.create_user(username="user1", password="password123")
+    api_client.force_authenticate(user=user)
+
+    response = api_client.post(reverse('vote-list'), {"menu": menu1.id})
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert VoteTally.objects.get(menu=menu1).count == 1
+
+    response = api_client.post(reverse('vote-list'), {"menu": menu1.id})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert VoteTally.objects.get(menu=menu1).count == 1
+
+
+@pytest.mark.django_db
+def test_tally_follows_vote_changes(menus):
+    menu1, menu2 = menus
+    user = User.objects.create_user(username="user1", password="password123")
+
+    vote = Vote.objects.create(user=user, menu=menu1)
+    vote.menu = menu2
+    vote.save()
+
+    assert VoteTally.objects.get(menu=menu1).count == 0
+    assert VoteTally.objects.get(menu=menu2).count == 1
+
+    vote.delete()
+
+    assert VoteTally.objects.get(menu=menu2).count == 0
+
+
+@pytest.mark.django_db
+def test_current_day_results_skip_empty_tallies(api_client, menus):
+    menu1, menu2 = menus
+    user = User.objects.create_user(username="user1", password="password123")
+    Vote.objects.create(user=user, menu=menu1)
+    Vote.objects.create(user=user, menu=menu2).delete()
+    api_client.force_authenticate(user=user)
+
+    response = api_client.get(reverse('current_results'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert list(response.data) == [{'menu__name': 'Menu 1', 'total_votes': 1}]
+
+
+@pytest.mark.django_db
+def test_rebuild_vote_tallies_command(menus):
+    menu1, menu2 = menus
+    user = User.objects.create_user(username="user1", password="password123")
+    Vote.objects.create(user=user, menu=menu1)
+    Vote.objects.create(user=user, menu=menu2)
+    VoteTally.objects.filter(menu=menu1).update(count=5)
+    VoteTally.objects.filter(menu=menu2).delete()
+
+    with pytest.raises(CommandError):
+        call_command('rebuild_vote_tallies', '--verify')
+
+    call_command('rebuild_vote_tallies')
+
+    assert dict(VoteTally.objects.values_list('menu_id', 'count')) == {menu1.id: 1, menu2.id: 1}
+    call_command('rebuild_vote_tallies', '--verify')
+
+
+@pytest.mark.django_db
+def test_results_follow_a_moved_menu(api_client, menus):
+    menu1, _ = menus
+    user = User.objects.create_user(username="user1", password="password123")
+    Vote.objects.create(user=user, menu=menu1)
+    api_client.force_authenticate(user=user)
+    assert len(api_client.get(reverse('current_results')).data) == 1
+
+    menu1.date = date.today() + timedelta(days=1)
+    menu1.save()
+
+    assert VoteTally.objects.get(menu=menu1).date == menu1.date
+    assert list(api_client.get(reverse('current_results')).data) == []
+
+
+@pytest.mark.django_db
+def test_rebuild_refuses_votes_without_dates(menus):
+    Vote.objects.create(user=User.objects.create_user(username="user1", password="password123"), menu=menus[0])
+    Vote.objects.update(date=None)
+
+    with pytest.raises(CommandError, match='backfill_vote_dates'):
+        call_command('rebuild_vote_tallies')
+    assert VoteTally.objects.get(menu=menus[0]).count == 1
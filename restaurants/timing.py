@@ -0,0 +1,40 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from rest_framework import serializers
+
+# Set per request by PerformanceInstrumentationMiddleware; serializers only time themselves while it is set.
+serialization_timer = ContextVar('serialization_timer', default=None)
+
+
+class SerializationTimer:
+    def __init__(self):
+        self.duration = 0.0
+        self.depth = 0
+
+    @contextmanager
+    def measure(self):
+        # Nested serializers run inside their parent's to_representation; only the outermost call counts.
+        self.depth += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            if not self.depth:
+                self.duration += (time.perf_counter() - started) * 1000
+
+
+class TimedSerializerMixin:
+    def to_representation(self, instance):
+        timer = serialization_timer.get()
+        if timer is None:
+            return super().to_representation(instance)
+        with timer.measure():
+            return super().to_representation(instance)
+
+
+class TimedListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    # Covers the queryset evaluation of many=True serializers as well.
+    pass
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from django.views import View
+from rest_framework.permissions import AllowAny
+
+from restaurants.schema import FORMATS, schema_info, schemas
+
+_ui_views = {}
+
+
+def schema_response(request, version, fmt):
+    document = schemas.get(version, fmt)
+    if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+    if document.etag in if_none_match or '*' in if_none_match:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(document.content, content_type=FORMATS[fmt])
+    response['ETag'] = document.etag
+    response['Cache-Control'] = f'public, max-age={settings.OPENAPI_SCHEMA_MAX_AGE}'
+    return response
+
+
+class SchemaDocumentView(View):
+    version = 'v1'
+
+    def get(self, request, format):
+        fmt = format.lstrip('.')
+        if fmt not in FORMATS:
+            raise Http404
+        return schema_response(request, self.version, fmt)
+
+
+class SchemaUIView(View):
+    version = 'v1'
+    ui = 'swagger'
+
+    def get(self, request):
+        # The UI pages load their spec from ?format=openapi on the same URL.
+        if request.GET.get('format') == 'openapi':
+            return schema_response(request, self.version, 'json')
+        return self.ui_view()(request)
+
+    def ui_view(self):
+        key = (self.version, self.ui)
+        if key not in _ui_views:
+            from drf_yasg.views import get_schema_view
+
+            # Renders only the HTML shell, which the drf_yasg view does without introspecting the API.
+            view = get_schema_view(schema_info(self.version), public=True, permission_classes=(AllowAny,))
+            _ui_views[key] = view.with_ui(self.ui, cache_timeout=0)
+        return _ui_views[key]
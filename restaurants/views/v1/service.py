@@ -1,4 +1,19 @@
-from restaurants.models import Restaurant, Dish, Menu, Vote
+import codecs
+import csv
+import json
+from collections import defaultdict
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Q, Sum
+from restaurants.cache import MenuCache, ballot_resets, ballot_versions, get_restaurant_by_api_key, menu_versions
+from restaurants.models import Restaurant, Dish, Menu, Vote, VoteTally, DailyVoteRollup, RolledUpDay, RankedBallot
+from restaurants.hashing import hash_passwords
+from restaurants.tally import ranked_tallies
+from restaurants.serializers import DishSerializer, EmployeeImportSerializer
 from rest_framework import serializers
 from rest_framework.exceptions import APIException
 from datetime import date
@@ -14,6 +29,21 @@ class CustomAPIException404(APIException):
     default_code = 'invalid_api_key'
 
 
+def read_uploaded_rows(request):
+    upload = request.FILES.get('file')
+    if upload is not None:
+        return csv.DictReader(codecs.iterdecode(upload, 'utf-8-sig'))
+    if isinstance(request.data, list):
+        return request.data
+    raise serializers.ValidationError({"error": "Send a JSON array or a CSV file in the 'file' field."})
+
+
+def require_vote_dates():
+    # Day-scoped vote queries filter on Vote.date, which older votes only get from backfill_vote_dates.
+    if Vote.objects.filter(date__isnull=True).exists():
+        raise serializers.ValidationError({"error": "Some votes have no date yet; run backfill_vote_dates first."})
+
+
 class MenuService:
     @staticmethod
     def get_restaurant_and_dishes(dish_ids, api_key):
@@ -24,7 +54,7 @@ class MenuService:
         if not dish_ids or dish_ids == []:
             raise serializers.ValidationError({"error": "At least one dish is required."})
         try:
-            restaurant = Restaurant.objects.get(api_key=api_key)
+            restaurant = get_restaurant_by_api_key(api_key)
         except Restaurant.DoesNotExist:
             raise CustomAPIException404('Restaurant not found')
 
@@ -34,6 +64,42 @@ class MenuService:
 
         return restaurant, dishes
 
+    @staticmethod
+    def publish_batch(restaurant, entries):
+        dish_ids = {dish_id for entry in entries for dish_id in entry['dish_ids']}
+        owned = set(Dish.objects.filter(id__in=dish_ids, restaurant=restaurant).values_list('id', flat=True))
+        if owned != dish_ids:
+            raise serializers.ValidationError({"error": "One or more dishes do not belong to this restaurant.",
+                                               "dish_ids": sorted(dish_ids - owned)})
+
+        keys = [(entry['date'], entry['name']) for entry in entries]
+        if len(set(keys)) != len(keys):
+            raise serializers.ValidationError({"error": "Each menu in a batch needs a unique date and name."})
+        existing = set(Menu.objects.filter(
+            restaurant=restaurant,
+            date__in={day for day, _ in keys},
+            name__in={name for _, name in keys},
+        ).values_list('date', 'name'))
+        conflicts = [{'date': day, 'name': name} for day, name in keys if (day, name) in existing]
+        if conflicts:
+            raise serializers.ValidationError({"error": "These menus already exist.", "menus": conflicts})
+
+        # The check above gives a helpful report; the unique constraint still decides concurrent publishes.
+        try:
+            with transaction.atomic():
+                menus = Menu.objects.bulk_create(
+                    [Menu(restaurant=restaurant, date=entry['date'], name=entry['name']) for entry in entries])
+                Menu.dishes.through.objects.bulk_create([
+                    Menu.dishes.through(menu_id=menu.id, dish_id=dish_id)
+                    for menu, entry in zip(menus, entries)
+                    for dish_id in set(entry['dish_ids'])
+                ])
+        except IntegrityError:
+            raise serializers.ValidationError({"error": "These menus already exist."})
+        MenuCache.invalidate(*(day for day, _ in keys))
+
+        return Menu.objects.filter(id__in=[menu.id for menu in menus]).prefetch_related('dishes').order_by('date', 'id')
+
 
 class DishService:
     @staticmethod
@@ -42,13 +108,146 @@ class DishService:
             raise serializers.ValidationError({"error": "x-api-key is required in header. "
                                                         "The API administrator can give it to you"})
         try:
-            restaurant = Restaurant.objects.get(api_key=api_key)
+            restaurant = get_restaurant_by_api_key(api_key)
         except Restaurant.DoesNotExist:
             raise CustomAPIException404('Invalid API Key.')
 
         return restaurant
 
 
+class DishImportService:
+    BATCH_SIZE = 1000
+
+    @staticmethod
+    def import_dishes(restaurant, rows, upsert=False):
+        report = {'created': 0, 'updated': 0, 'errors': []}
+        seen_names = set()
+        numbered_rows = enumerate(rows, start=1)
+        while True:
+            batch = list(islice(numbered_rows, DishImportService.BATCH_SIZE))
+            if not batch:
+                report['errors'].sort(key=lambda error: error['row'])
+                return report
+
+            dishes = {}
+            for row_number, row in batch:
+                serializer = DishSerializer(data=row)
+                if not serializer.is_valid():
+                    report['errors'].append({'row': row_number, 'errors': serializer.errors})
+                    continue
+                name = serializer.validated_data['name']
+                if name in seen_names:
+                    report['errors'].append({'row': row_number, 'errors': {'name': ['Duplicate dish name in upload.']}})
+                    continue
+                seen_names.add(name)
+                dishes[name] = (row_number, Dish(restaurant=restaurant, **serializer.validated_data))
+
+            DishImportService._write_batch(restaurant, dishes, upsert, report)
+
+    @staticmethod
+    def _write_batch(restaurant, dishes, upsert, report):
+        existing = set(Dish.objects.filter(restaurant=restaurant, name__in=dishes).values_list('name', flat=True))
+        with transaction.atomic():
+            if upsert:
+                Dish.objects.bulk_create(
+                    [dish for _, dish in dishes.values()],
+                    update_conflicts=True,
+                    unique_fields=['restaurant', 'name'],
+                    update_fields=['description', 'price'],
+                )
+                report['created'] += len(dishes) - len(existing)
+                report['updated'] += len(existing)
+                if existing:
+                    MenuCache.invalidate(*Menu.objects.filter(
+                        dishes__restaurant=restaurant, dishes__name__in=existing).values_list('date', flat=True).distinct())
+            else:
+                for name in existing:
+                    row_number, _ = dishes.pop(name)
+                    DishImportService._report_existing(report, row_number)
+                try:
+                    with transaction.atomic():
+                        Dish.objects.bulk_create([dish for _, dish in dishes.values()])
+                    report['created'] += len(dishes)
+                except IntegrityError:
+                    # A concurrent import added some of these names; insert row by row to find them.
+                    for row_number, dish in dishes.values():
+                        dish.pk = None
+                        try:
+                            with transaction.atomic():
+                                dish.save()
+                            report['created'] += 1
+                        except IntegrityError:
+                            DishImportService._report_existing(report, row_number)
+
+    @staticmethod
+    def _report_existing(report, row_number):
+        report['errors'].append({'row': row_number,
+                                 'errors': {'name': ['This restaurant already has a dish with this name.']}})
+
+
+class EmployeeImportService:
+    ROLES = ('Admin', 'Employee')
+
+    @staticmethod
+    def import_employees(rows, workers=None):
+        workers = settings.EMPLOYEE_IMPORT_WORKERS if workers is None else workers
+        report = {'created': 0, 'errors': []}
+
+        employees = {}
+        for row_number, row in enumerate(rows, start=1):
+            serializer = EmployeeImportSerializer(data=row)
+            if not serializer.is_valid():
+                report['errors'].append({'row': row_number, 'errors': serializer.errors})
+            elif serializer.validated_data['username'] in employees:
+                report['errors'].append({'row': row_number,
+                                         'errors': {'username': ['Duplicate username in upload.']}})
+            else:
+                employees[serializer.validated_data['username']] = (row_number, serializer.validated_data)
+
+        usernames = list(employees)
+        for start in range(0, len(usernames), 1000):
+            for username in User.objects.filter(username__in=usernames[start:start + 1000]).values_list(
+                    'username', flat=True):
+                row_number, _ = employees.pop(username)
+                report['errors'].append({'row': row_number,
+                                         'errors': {'username': ['A user with that username already exists.']}})
+        report['errors'].sort(key=lambda error: error['row'])
+        if not employees:
+            return report
+
+        entries = list(employees.values())
+        hashes = hash_passwords([data['password'] for _, data in entries], workers)
+        groups = {role: Group.objects.get_or_create(name=role)[0] for role in EmployeeImportService.ROLES}
+
+        users = [
+            User(username=data['username'], password=password, is_staff=data['role'] == 'Admin',
+                 is_superuser=data['role'] == 'Admin')
+            for (_, data), password in zip(entries, hashes)
+        ]
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users, batch_size=1000)
+                User.groups.through.objects.bulk_create([
+                    User.groups.through(user_id=user.id, group_id=groups[data['role']].id)
+                    for user, (_, data) in zip(users, entries)
+                ], batch_size=1000)
+            report['created'] = len(users)
+        except IntegrityError:
+            # A concurrent signup or import took some usernames; create row by row to find them.
+            for user, (row_number, data) in zip(users, entries):
+                user.pk = None
+                try:
+                    with transaction.atomic():
+                        user.save()
+                        user.groups.add(groups[data['role']])
+                    report['created'] += 1
+                except IntegrityError:
+                    report['errors'].append({'row': row_number,
+                                             'errors': {'username': ['A user with that username already exists.']}})
+            report['errors'].sort(key=lambda error: error['row'])
+        return report
+
+
 class VoteService:
     @staticmethod
     def create_vote(menu_id, user):
@@ -60,9 +259,287 @@ class VoteService:
         except Menu.DoesNotExist:
             raise CustomAPIException404("Menu not found or not available today.")
 
-        if Vote.objects.filter(user=user, menu=menu).exists():
+        # The unique (user, menu) constraint is the duplicate check, so concurrent votes cannot race past it.
+        try:
+            with transaction.atomic():
+                Vote.objects.create(user=user, menu=menu)
+        except IntegrityError:
             raise serializers.ValidationError({"error": "You have already voted for this menu."})
 
-        vote = Vote.objects.create(user=user, menu=menu)
-
         return menu
+
+
+class RankedBallotSource:
+    def __init__(self, day):
+        self.day = day
+
+    def menus(self):
+        return list(Menu.objects.filter(date=self.day).values_list('id', 'name'))
+
+    def ballots(self, after_id=0):
+        return RankedBallot.objects.filter(date=self.day, id__gt=after_id).order_by('id').values_list(
+            'id', 'ranking', 'weight').iterator(chunk_size=2000)
+
+    def count(self):
+        return RankedBallot.objects.filter(date=self.day).count()
+
+
+class RankedBallotService:
+    METHODS = ('irv', 'borda')
+
+    @staticmethod
+    def submit(user, ranking):
+        if not isinstance(ranking, list) or not ranking:
+            raise serializers.ValidationError({"error": "Ranking must be a non-empty list of menu IDs."})
+        try:
+            ranking = [int(menu_id) for menu_id in ranking]
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({"error": "Ranking must only contain menu IDs."})
+        if len(set(ranking)) != len(ranking):
+            raise serializers.ValidationError({"error": "Each menu can only be ranked once."})
+
+        today = date.today()
+        available = set(Menu.objects.filter(id__in=ranking, date=today).values_list('id', flat=True))
+        if len(available) != len(ranking):
+            raise CustomAPIException404("Menu not found or not available today.")
+
+        try:
+            with transaction.atomic():
+                return RankedBallot.objects.create(user=user, date=today, ranking=ranking)
+        except IntegrityError:
+            raise serializers.ValidationError({"error": "You have already submitted a ballot today."})
+
+    @staticmethod
+    def tally(day):
+        identity = (menu_versions.get(day), ballot_resets.get(day))
+        return ranked_tallies.get(day, identity, ballot_versions.get(day), RankedBallotSource(day))
+
+    @staticmethod
+    def current_results(day, method):
+        if method not in RankedBallotService.METHODS:
+            raise serializers.ValidationError({"error": f"method must be one of: {', '.join(RankedBallotService.METHODS)}."})
+
+        tally = RankedBallotService.tally(day)
+        if method == 'borda':
+            results = [entry for entry in tally.borda() if entry['score']]
+            return {'method': method, 'winner': results[0] if results else None, 'results': results}
+        return {'method': method, **tally.instant_runoff()}
+
+
+class VoteTallyService:
+    @staticmethod
+    def add(menu, delta=1):
+        updated = VoteTally.objects.filter(menu_id=menu.id).update(count=F('count') + delta)
+        if updated or delta < 0:
+            return
+        tally, created = VoteTally.objects.get_or_create(menu_id=menu.id, defaults={'date': menu.date, 'count': delta})
+        if not created:
+            VoteTally.objects.filter(pk=tally.pk).update(count=F('count') + delta)
+
+    @staticmethod
+    def remove(menu_id):
+        VoteTally.objects.filter(menu_id=menu_id, count__gt=0).update(count=F('count') - 1)
+
+    @staticmethod
+    def current_results(day):
+        return list(VoteTally.objects.filter(date=day, count__gt=0).values(
+            'menu__name', total_votes=F('count')).order_by('-count', 'menu_id'))
+
+    @staticmethod
+    def count_votes(day=None):
+        require_vote_dates()
+        votes = Vote.objects.all()
+        if day is not None:
+            votes = votes.filter(date=day)
+        return {
+            row['menu_id']: (row['date'], row['total'])
+            for row in votes.values('menu_id', 'date').annotate(total=Count('id'))
+        }
+
+    @staticmethod
+    def rebuild(day=None):
+        with transaction.atomic():
+            # A vote updates its tally in its own transaction; with writers to the tally table held
+            # off until commit, each vote is either counted here or added on top of the new tally.
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LOCK TABLE {connection.ops.quote_name(VoteTally._meta.db_table)} '
+                                   f'IN SHARE ROW EXCLUSIVE MODE')
+            counts = VoteTallyService.count_votes(day)
+            tallies = VoteTally.objects.all()
+            if day is not None:
+                tallies = tallies.filter(date=day)
+            tallies.delete()
+            VoteTally.objects.bulk_create(
+                [VoteTally(menu_id=menu_id, date=menu_date, count=total)
+                 for menu_id, (menu_date, total) in counts.items()],
+                batch_size=1000,
+            )
+        return len(counts)
+
+    @staticmethod
+    def verify(day=None):
+        counts = VoteTallyService.count_votes(day)
+        tallies = VoteTally.objects.all()
+        if day is not None:
+            tallies = tallies.filter(date=day)
+        stored = dict(tallies.values_list('menu_id', 'count'))
+
+        mismatches = []
+        for menu_id in sorted(set(counts) | set(stored)):
+            expected = counts.get(menu_id, (None, 0))[1]
+            actual = stored.get(menu_id, 0)
+            if expected != actual:
+                mismatches.append((menu_id, expected, actual))
+        return mismatches
+
+
+class VoteExportService:
+    FIELDS = ['vote_id', 'voted_at', 'username', 'menu_id', 'menu_name', 'menu_date', 'restaurant_id',
+              'restaurant_name']
+    FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+    CHUNK_SIZE = 2000
+
+    @staticmethod
+    def parse_filters(params):
+        filters = {}
+        try:
+            if params.get('date_from'):
+                filters['date_from'] = date.fromisoformat(params['date_from'])
+            if params.get('date_to'):
+                filters['date_to'] = date.fromisoformat(params['date_to'])
+        except ValueError:
+            raise serializers.ValidationError({"error": "date_from and date_to must be dates in YYYY-MM-DD format."})
+        if params.get('restaurant'):
+            try:
+                filters['restaurant_id'] = int(params['restaurant'])
+            except ValueError:
+                raise serializers.ValidationError({"error": "restaurant must be a restaurant id."})
+        return filters
+
+    @staticmethod
+    def get_rows(date_from=None, date_to=None, restaurant_id=None):
+        require_vote_dates()
+        votes = Vote.objects.order_by('id')
+        if date_from:
+            votes = votes.filter(date__gte=date_from)
+        if date_to:
+            votes = votes.filter(date__lte=date_to)
+        if restaurant_id:
+            votes = votes.filter(menu__restaurant_id=restaurant_id)
+        return votes.values_list(
+            'id', 'voted_at', 'user__username', 'menu_id', 'menu__name', 'date', 'menu__restaurant_id',
+            'menu__restaurant__name',
+        ).iterator(chunk_size=VoteExportService.CHUNK_SIZE)
+
+    @staticmethod
+    def stream(rows, output_format):
+        if output_format == 'ndjson':
+            for row in rows:
+                yield json.dumps(dict(zip(VoteExportService.FIELDS, row)), default=str) + '\n'
+            return
+
+        buffer = _LineBuffer()
+        writer = csv.writer(buffer)
+        yield writer.writerow(VoteExportService.FIELDS)
+        for row in rows:
+            yield writer.writerow(row)
+
+
+class VoteRollupService:
+    @staticmethod
+    def pending_days(until):
+        return list(Menu.objects.filter(date__lte=until).exclude(
+            date__in=RolledUpDay.objects.values('date')).values_list('date', flat=True).distinct().order_by('date'))
+
+    @staticmethod
+    def rollup(until=None, rebuild=False, keep_months=()):
+        # Only closed days are rolled up; today's votes keep changing.
+        until = until or date.today() - timedelta(days=1)
+        if rebuild:
+            require_vote_dates()
+            # Months whose votes were archived can no longer be recomputed.
+            stale = Q(date__lte=until)
+            for month in keep_months:
+                stale &= ~Q(date__year=month.year, date__month=month.month)
+            with transaction.atomic():
+                DailyVoteRollup.objects.filter(stale).delete()
+                RolledUpDay.objects.filter(stale).delete()
+
+        days = VoteRollupService.pending_days(until)
+        if days and not rebuild:
+            require_vote_dates()
+        for day in days:
+            counts = Vote.objects.filter(date=day).values('menu_id', 'menu__restaurant_id').annotate(
+                total=Count('id'))
+            with transaction.atomic():
+                DailyVoteRollup.objects.filter(date=day).delete()
+                DailyVoteRollup.objects.bulk_create([
+                    DailyVoteRollup(date=day, restaurant_id=row['menu__restaurant_id'], menu_id=row['menu_id'],
+                                    votes=row['total'])
+                    for row in counts
+                ])
+                RolledUpDay.objects.create(date=day)
+        return days
+
+
+class VoteAnalyticsService:
+    GRANULARITIES = {
+        'day': lambda day: day,
+        'week': lambda day: day - timedelta(days=day.weekday()),
+        'month': lambda day: day.replace(day=1),
+    }
+
+    @staticmethod
+    def parse_params(params):
+        granularity = params.get('granularity', 'day')
+        if granularity not in VoteAnalyticsService.GRANULARITIES:
+            raise serializers.ValidationError(
+                {"error": f"granularity must be one of: {', '.join(VoteAnalyticsService.GRANULARITIES)}."})
+        filters = VoteExportService.parse_filters(params)
+        filters['granularity'] = granularity
+        return filters
+
+    @staticmethod
+    def restaurant_stats(date_from=None, date_to=None, restaurant_id=None, granularity='day'):
+        rollups = DailyVoteRollup.objects.all()
+        if date_from:
+            rollups = rollups.filter(date__gte=date_from)
+        if date_to:
+            rollups = rollups.filter(date__lte=date_to)
+        daily = rollups.values('date', 'restaurant_id', 'restaurant__name').annotate(votes=Sum('votes')).order_by(
+            'date', '-votes', 'restaurant_id')
+
+        period_of = VoteAnalyticsService.GRANULARITIES[granularity]
+        stats = defaultdict(lambda: {'votes': 0, 'days_won': 0})
+        period_totals = defaultdict(int)
+        winners = {}
+        for row in daily:
+            period = period_of(row['date'])
+            key = (period, row['restaurant_id'], row['restaurant__name'])
+            stats[key]['votes'] += row['votes']
+            period_totals[period] += row['votes']
+            # Rows are ordered by votes, then id, so the first one of a day is its winner.
+            if row['date'] not in winners and row['votes']:
+                winners[row['date']] = row['restaurant_id']
+                stats[key]['days_won'] += 1
+
+        results = [
+            {
+                'period': period,
+                'restaurant_id': rid,
+                'restaurant_name': name,
+                'votes': values['votes'],
+                'share': round(values['votes'] / period_totals[period], 4) if period_totals[period] else 0,
+                'days_won': values['days_won'],
+            }
+            for (period, rid, name), values in stats.items()
+            if not restaurant_id or rid == restaurant_id
+        ]
+        results.sort(key=lambda item: (item['period'], -item['votes'], item['restaurant_id']))
+        return results
+
+
+class _LineBuffer:
+    def write(self, value):
+        return value
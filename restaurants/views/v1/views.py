@@ -1,18 +1,60 @@
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from django.utils import timezone
+from django.utils.http import parse_etags
+from django.views import View
 from rest_framework.views import APIView
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Count
 from datetime import date
-from django.contrib.auth.models import User
+from django.contrib.auth.models import Group, User
+from django.db.models import Prefetch
+from restaurants.authentication import TokenClaimsAuthentication
+from restaurants.cache import MenuCache, current_results_versions, menu_versions, ranked_results_versions
+from restaurants.db_pool import pool_stats
+from restaurants.fieldsets import SparseFieldsetViewMixin, fieldset_key, request_fieldset, sparse_queryset
+from restaurants.live import stream_results
 from restaurants.models import Restaurant, Menu, Vote, Dish
-from restaurants.serializers import RestaurantSerializer, MenuSerializer, DishSerializer, VoteSerializer, UserSerializer
-from restaurants.views.v1.service import MenuService, DishService, VoteService
+from restaurants.pagination import VoteKeysetPagination
+from restaurants.serializers import RestaurantSerializer, MenuSerializer, MenuBatchEntrySerializer, DishSerializer, \
+    VoteSerializer, UserSerializer
+from restaurants.views.v1.service import MenuService, DishService, DishImportService, EmployeeImportService, \
+    VoteService, VoteExportService, VoteTallyService, VoteAnalyticsService, RankedBallotService, read_uploaded_rows
+
+
+def versioned_response(request, versions, day, build):
+    # The ETag is read before the data so a concurrent write can only make the payload newer than its tag.
+    etag = versions.etag(day)
+    if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+    if etag in if_none_match or '*' in if_none_match:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(build(), status=status.HTTP_200_OK)
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
 
 
-class RestaurantViewSetV1(viewsets.ModelViewSet):
+async def iterate_in_batches(iterator, size):
+    # Under ASGI a sync iterator is drained into a list before streaming; pull it a batch at a time instead.
+    next_batch = sync_to_async(lambda: list(islice(iterator, size)))
+    while True:
+        batch = await next_batch()
+        if not batch:
+            return
+        for item in batch:
+            yield item
+
+
+class RestaurantViewSetV1(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Restaurant.objects.all()
     serializer_class = RestaurantSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
@@ -21,16 +63,28 @@ class RestaurantViewSetV1(viewsets.ModelViewSet):
         serializer.save()
 
 
-class MenuViewSet(viewsets.ModelViewSet):
-    queryset = Menu.objects.all()
+class MenuViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = Menu.objects.prefetch_related('dishes')
     serializer_class = MenuSerializer
     permission_classes = [AllowAny]
+    pagination_class = None
 
     def get_queryset(self):
+        # Schemas are generated without a request.
+        if getattr(self, 'swagger_fake_view', False):
+            return self.queryset.none()
         restaurant_id = self.request.query_params.get('restaurant', None)
         if restaurant_id:
-            return Menu.objects.filter(restaurant__id=restaurant_id, date=date.today())
-        return Menu.objects.filter(date=date.today())
+            return self.sparse_queryset(self.queryset.filter(restaurant__id=restaurant_id, date=date.today()))
+        return self.sparse_queryset(self.queryset.filter(date=date.today()))
+
+    def list(self, request, *args, **kwargs):
+        restaurant_id = request.query_params.get('restaurant', None)
+        today = date.today()
+        # Built up front so an invalid fieldset is rejected before the cache lookup.
+        serializer = self.get_serializer(self.get_queryset(), many=True)
+        return versioned_response(request, menu_versions, today, lambda: MenuCache.get_or_set(
+            today, restaurant_id, lambda: serializer.data, self.fieldset_key()))
 
     def perform_create(self, serializer):
         dish_ids = self.request.data.get('dish_ids', [])
@@ -39,19 +93,43 @@ class MenuViewSet(viewsets.ModelViewSet):
         if isinstance(result, Response):
             return result
         restaurant, dishes = result
-        menu = serializer.save(restaurant=restaurant)
-        menu.dishes.set(dishes)
-        menu.save()
+        serializer.save(restaurant=restaurant)
+
+    @action(detail=False, methods=['post'], url_path='batch')
+    def batch(self, request):
+        restaurant = DishService.create_dishes(request.headers.get('x-api-key'))
+        entries = MenuBatchEntrySerializer(data=request.data, many=True)
+        entries.is_valid(raise_exception=True)
+        menus = MenuService.publish_batch(restaurant, entries.validated_data)
+        return Response(MenuSerializer(menus, many=True).data, status=status.HTTP_201_CREATED)
 
 
 class CurrentDayMenuView(APIView):
+    authentication_classes = [TokenClaimsAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         today = timezone.now().date()
-        menus = Menu.objects.filter(date=today)
-        serializer = MenuSerializer(menus, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        fieldset = request_fieldset(request)
+        menus = sparse_queryset(MenuSerializer(**fieldset), Menu.objects.filter(date=today).prefetch_related('dishes'),
+                                fieldset)
+        serializer = MenuSerializer(menus, many=True, **fieldset)
+        return versioned_response(request, menu_versions, today, lambda: MenuCache.get_or_set(
+            today, None, lambda: serializer.data, fieldset_key(fieldset)))
+
+
+class MenuCacheStatsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        return Response(MenuCache.stats(), status=status.HTTP_200_OK)
+
+
+class DatabasePoolStatsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        return Response(pool_stats(), status=status.HTTP_200_OK)
 
 
 class EmployeeViewSet(viewsets.ModelViewSet):
@@ -59,20 +137,94 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     serializer_class = UserSerializer
     permission_classes = [AllowAny]
 
+    def get_queryset(self):
+        if self.action != 'list':
+            return self.queryset
+
+        queryset = User.objects.only('id', 'username').prefetch_related(
+            Prefetch('groups', queryset=Group.objects.only('id', 'name')))
+        search = self.request.query_params.get('search')
+        if search:
+            queryset = queryset.filter(username__startswith=search)
+        role = self.request.query_params.get('role')
+        if role:
+            queryset = queryset.filter(groups__name=role)
+        return queryset
+
     def perform_create(self, serializer):
         serializer.save()
 
+    @action(detail=False, methods=['post'], url_path='bulk', parser_classes=[JSONParser, MultiPartParser],
+            permission_classes=[IsAuthenticated, IsAdminUser])
+    def bulk(self, request):
+        report = EmployeeImportService.import_employees(read_uploaded_rows(request))
+        return Response(report, status=status.HTTP_200_OK)
+
 
 class CurrentDayResultsViewSet(viewsets.ViewSet):
+    authentication_classes = [TokenClaimsAuthentication]
     permission_classes = [IsAuthenticated]
 
     def list(self, request):
-        votes = Vote.objects.filter(menu__date=date.today()).values('menu__name').annotate(
-            total_votes=Count('menu')).order_by('-total_votes')
-        return Response(votes, status=status.HTTP_200_OK)
+        today = date.today()
+        return versioned_response(request, current_results_versions, today,
+                                  lambda: VoteTallyService.current_results(today))
 
 
-class DishViewSet(viewsets.ModelViewSet):
+class CurrentDayRankedResultsViewSet(viewsets.ViewSet):
+    authentication_classes = [TokenClaimsAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def list(self, request):
+        today = date.today()
+        method = request.query_params.get('method', 'irv')
+        return versioned_response(request, ranked_results_versions, today,
+                                  lambda: RankedBallotService.current_results(today, method))
+
+
+class RankedBallotView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        ballot = RankedBallotService.submit(request.user, request.data.get('ranking'))
+        return Response({"message": "Ballot submitted successfully.", "ranking": ballot.ranking},
+                        status=status.HTTP_201_CREATED)
+
+
+class CurrentDayResultsStreamView(View):
+    async def get(self, request):
+        # Under WSGI the stream would hold a worker thread for as long as the client stays connected.
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse({"error": "Live results need an ASGI server (lunch_decider.asgi)."},
+                                status=status.HTTP_501_NOT_IMPLEMENTED)
+        user = await sync_to_async(self.authenticate)(request)
+        if user is None:
+            return JsonResponse({"detail": "Authentication credentials were not provided."},
+                                status=status.HTTP_401_UNAUTHORIZED)
+
+        response = StreamingHttpResponse(stream_results(date.today()), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    @staticmethod
+    def authenticate(request):
+        try:
+            result = TokenClaimsAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return None
+        return result[0] if result else None
+
+
+class VoteAnalyticsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request):
+        params = VoteAnalyticsService.parse_params(request.query_params)
+        return Response(VoteAnalyticsService.restaurant_stats(**params), status=status.HTTP_200_OK)
+
+
+class DishViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Dish.objects.all()
     serializer_class = DishSerializer
     permission_classes = [AllowAny]
@@ -82,11 +234,20 @@ class DishViewSet(viewsets.ModelViewSet):
         restaurant = DishService.create_dishes(api_key)
         serializer.save(restaurant=restaurant)
 
+    @action(detail=False, methods=['post'], url_path='bulk', parser_classes=[JSONParser, MultiPartParser])
+    def bulk(self, request):
+        restaurant = DishService.create_dishes(request.headers.get('x-api-key'))
+        rows = read_uploaded_rows(request)
+        upsert = request.query_params.get('upsert', '').lower() in ('1', 'true', 'yes')
+        report = DishImportService.import_dishes(restaurant, rows, upsert=upsert)
+        return Response(report, status=status.HTTP_200_OK)
+
 
 class VoteViewSet(viewsets.ModelViewSet):
     queryset = Vote.objects.all()
     serializer_class = VoteSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = VoteKeysetPagination
 
     def create(self, request, *args, **kwargs):
         user = request.user
@@ -95,3 +256,17 @@ class VoteViewSet(viewsets.ModelViewSet):
         menu = VoteService.create_vote(menu_id, user)
 
         return Response({"message": f"Voted for {menu.name} successfully."}, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'], url_path='export', permission_classes=[IsAuthenticated, IsAdminUser])
+    def export(self, request):
+        output_format = request.query_params.get('output', 'csv')
+        if output_format not in VoteExportService.FORMATS:
+            raise ValidationError({"error": f"output must be one of: {', '.join(VoteExportService.FORMATS)}."})
+
+        rows = VoteExportService.get_rows(**VoteExportService.parse_filters(request.query_params))
+        lines = VoteExportService.stream(rows, output_format)
+        if isinstance(request._request, ASGIRequest):
+            lines = iterate_in_batches(lines, VoteExportService.CHUNK_SIZE)
+        response = StreamingHttpResponse(lines, content_type=VoteExportService.FORMATS[output_format])
+        response['Content-Disposition'] = f'attachment; filename="votes.{output_format}"'
+        return response
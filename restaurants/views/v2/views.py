@@ -1,36 +1,75 @@
+from datetime import date, timedelta
+
+from django.db.models import Count, Q
 from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
+from restaurants.fieldsets import SparseFieldsetViewMixin
 from restaurants.models import Restaurant
+from restaurants.pagination import PageLimitPagination
+from restaurants.schema import auto_schema
 from restaurants.serializers import RestaurantSerializer
-from drf_yasg.utils import swagger_auto_schema
 
 
-class RestaurantViewSetV2(viewsets.ModelViewSet):
+class RestaurantViewSetV2(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Restaurant.objects.all()
     serializer_class = RestaurantSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
+    pagination_class = PageLimitPagination
+
+    def get_menu_count_filter(self):
+        params = self.request.query_params
+        window = params.get('menus_window')
+        today = date.today()
+        monday = today - timedelta(days=today.weekday())
+        first = today.replace(day=1)
+        windows = {
+            'today': (today, today),
+            'week': (monday, monday + timedelta(days=6)),
+            'month': (first, (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)),
+        }
+        if window and window not in windows:
+            raise ValidationError({"error": f"menus_window must be one of: {', '.join(windows)}."})
+
+        window_from, window_to = windows.get(window, (None, None))
+        try:
+            date_from = date.fromisoformat(params['menus_from']) if params.get('menus_from') else window_from
+            date_to = date.fromisoformat(params['menus_to']) if params.get('menus_to') else window_to
+        except ValueError:
+            raise ValidationError({"error": "menus_from and menus_to must be dates in YYYY-MM-DD format."})
+
+        menu_filter = Q()
+        if date_from:
+            menu_filter &= Q(menus__date__gte=date_from)
+        if date_to:
+            menu_filter &= Q(menus__date__lte=date_to)
+        return menu_filter or None
 
-    @swagger_auto_schema(tags=['v2'])
+    @auto_schema(tags=['v2'])
     def list(self, request, *args, **kwargs):
         app_version = request.app_version
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
+        queryset = self.get_queryset().annotate(
+            menu_count=Count('menus', filter=self.get_menu_count_filter())).order_by('id')
+
+        page = self.paginate_queryset(queryset)
+        restaurants = page if page is not None else list(queryset)
+        serializer = self.get_serializer(restaurants, many=True)
 
         response_data = [
             {
                 **restaurant_data,
-                'menu_count': restaurant.menus.count(),
+                'menu_count': restaurant.menu_count,
                 'additional_info': "New feature for version 2.0" if app_version == '2.0' else "You have version 1.0"
             }
-            for restaurant_data, restaurant in zip(serializer.data, queryset)
+            for restaurant_data, restaurant in zip(serializer.data, restaurants)
         ]
 
+        if page is not None:
+            return self.get_paginated_response(response_data)
         return Response(response_data, status=status.HTTP_200_OK)
 
-    @swagger_auto_schema(tags=['v2'])
+    @auto_schema(tags=['v2'])
     def perform_create(self, serializer):
         serializer.save()
-
-